@@ -0,0 +1,47 @@
+"""Add trigram search indexes to users
+
+Revision ID: b7e2c4a91d3f
+Revises: 3cd76b50f997
+Create Date: 2025-12-10 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4a91d3f'
+down_revision: Union[str, None] = '3cd76b50f997'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_SEARCH_COLUMNS = ('email', 'first_name', 'last_name')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for column in _SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_users_{column}_trgm',
+            'users',
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            postgresql_where=sa.text('is_deleted = false'),
+        )
+
+
+def downgrade() -> None:
+    # Расширение pg_trgm не удаляем: оно могло существовать до миграции
+    for column in _SEARCH_COLUMNS:
+        op.drop_index(
+            f'ix_users_{column}_trgm',
+            table_name='users',
+            postgresql_using='gin',
+            postgresql_where=sa.text('is_deleted = false'),
+        )
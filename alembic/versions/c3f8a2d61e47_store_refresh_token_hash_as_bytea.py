@@ -0,0 +1,43 @@
+"""Store refresh token hash as 16-byte bytea
+
+Revision ID: c3f8a2d61e47
+Revises: b7e2c4a91d3f
+Create Date: 2025-12-11 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a2d61e47'
+down_revision: Union[str, None] = 'b7e2c4a91d3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Старые hex-хеши несовместимы с новой схемой (HMAC, 16 байт):
+    # такие токены больше не совпадут ни с одним запросом, поэтому отзываем их
+    op.execute("UPDATE refresh_tokens SET is_revoked = true WHERE is_revoked = false")
+    op.alter_column(
+        'refresh_tokens',
+        'token_hash',
+        existing_type=sa.String(length=255),
+        type_=sa.LargeBinary(length=16),
+        existing_nullable=False,
+        postgresql_using="decode(substring(token_hash from 1 for 32), 'hex')",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'refresh_tokens',
+        'token_hash',
+        existing_type=sa.LargeBinary(length=16),
+        type_=sa.String(length=255),
+        existing_nullable=False,
+        postgresql_using="encode(token_hash, 'hex')",
+    )
@@ -0,0 +1,47 @@
+"""Add trigram search indexes to products
+
+Revision ID: d91a7c35e2b8
+Revises: c3f8a2d61e47
+Create Date: 2025-12-12 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91a7c35e2b8'
+down_revision: Union[str, None] = 'c3f8a2d61e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_SEARCH_COLUMNS = ('name', 'description')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for column in _SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_products_{column}_trgm',
+            'products',
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            postgresql_where=sa.text('is_deleted = false'),
+        )
+
+
+def downgrade() -> None:
+    # Расширение pg_trgm не удаляем: его использует миграция users (b7e2c4a91d3f)
+    for column in _SEARCH_COLUMNS:
+        op.drop_index(
+            f'ix_products_{column}_trgm',
+            table_name='products',
+            postgresql_using='gin',
+            postgresql_where=sa.text('is_deleted = false'),
+        )
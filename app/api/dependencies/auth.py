@@ -1,4 +1,3 @@
-import uuid
 from typing import Callable
 
 from fastapi import Depends, HTTPException, status
@@ -6,7 +5,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import decode_access_token
+from app.core.security import decode_access_token, parse_token_subject
 from app.models.user import User, UserRole
 from app.repositories.user import UserRepository
 
@@ -63,7 +62,7 @@ async def get_current_user(
         )
 
     try:
-        user_id = uuid.UUID(user_id_str)
+        user_id = parse_token_subject(user_id_str)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -7,6 +7,8 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DB_ECHO: bool = False
+    # Размер общего для всех сессий LRU кэша скомпилированных SQL выражений
+    DB_QUERY_CACHE_SIZE: int = 1200
 
     # Security
     SECRET_KEY: str
@@ -15,6 +17,11 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     TOKEN_ISSUER: str = "fastapi-shop"
+    # Ключ для HMAC хеша refresh токенов в БД (если не задан — выводится
+    # из REFRESH_TOKEN_SECRET с отдельной меткой назначения)
+    TOKEN_HASH_PEPPER: str | None = None
+    # Стоимость bcrypt (2^rounds итераций); в тестах снижается до минимума (4)
+    BCRYPT_ROUNDS: int = 12
 
     model_config = SettingsConfigDict(
         env_file=".env",
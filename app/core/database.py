@@ -1,4 +1,5 @@
 from typing import AsyncGenerator
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
@@ -6,10 +7,14 @@ from app.core.config import settings
 
 
 # Async engine
+# Скомпилированные выражения кэшируются на уровне engine и переиспользуются
+# всеми сессиями/запросами; размер увеличен с 500 по умолчанию, чтобы
+# комбинации фильтров списков не вытесняли горячие запросы
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DB_ECHO,
     future=True,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
 )
 
 # Async session factory
@@ -27,6 +32,26 @@ class Base(DeclarativeBase):
     pass
 
 
+def get_constraint_name(exc: IntegrityError) -> str | None:
+    """
+    Имя нарушенного constraint/уникального индекса из IntegrityError.
+
+    asyncpg кладёт исходное исключение драйвера в __cause__ DBAPI-обёртки,
+    psycopg — в атрибут diag.
+
+    Args:
+        exc: Исключение SQLAlchemy
+
+    Returns:
+        Имя constraint или None, если драйвер его не сообщил
+    """
+    orig = exc.orig
+    name = getattr(getattr(orig, "__cause__", None), "constraint_name", None)
+    if name is None:
+        name = getattr(getattr(orig, "diag", None), "constraint_name", None)
+    return name
+
+
 # Dependency для получения сессии БД
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -1,8 +1,14 @@
+import asyncio
 import hashlib 
+import hmac
+import os
+import time
 import uuid
 import bcrypt
 import jwt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 from app.core.config import settings
 
@@ -10,6 +16,44 @@ from app.core.config import settings
 # Максимальная длина пароля для bcrypt (в байтах)
 BCRYPT_MAX_BYTES = 72
 
+# Пул потоков для bcrypt: хеширование намеренно медленное (десятки-сотни мс CPU)
+# и не должно блокировать event loop. bcrypt отпускает GIL, поэтому потоки
+# дают настоящий параллелизм без fork. Размер ограничен: у каждого воркера
+# uvicorn свой пул, и они не должны вместе занять больше ядер, чем есть
+_PWD_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_pwd_pool: ThreadPoolExecutor | None = None
+
+# Длина хеша refresh токенов
+TOKEN_HASH_BYTES = 16
+
+# Метка разделения доменов: ключ хеширования токенов выводится из
+# REFRESH_TOKEN_SECRET, но не совпадает с ключом подписи JWT
+_TOKEN_HASH_KEY_LABEL = b"fastapi-shop/refresh-token-hash/v1"
+
+
+def _derive_token_hash_key() -> bytes:
+    """
+    Ключ HMAC для хеширования refresh токенов.
+
+    Явно заданный TOKEN_HASH_PEPPER используется как есть. Иначе ключ
+    выводится из REFRESH_TOKEN_SECRET через HMAC с меткой назначения,
+    чтобы один секрет не служил одновременно ключом подписи и pepper.
+
+    Returns:
+        Ключ HMAC-SHA256
+    """
+    if settings.TOKEN_HASH_PEPPER:
+        return settings.TOKEN_HASH_PEPPER.encode("utf-8")
+
+    return hmac.new(
+        settings.REFRESH_TOKEN_SECRET.encode("utf-8"),
+        _TOKEN_HASH_KEY_LABEL,
+        hashlib.sha256,
+    ).digest()
+
+
+_TOKEN_HASH_KEY = _derive_token_hash_key()
+
 
 def _ensure_password_length(password: str) -> None:
     """
@@ -50,7 +94,7 @@ def hash_password(password: str) -> str:
     
     # Генерируем salt и хешируем
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     
     # Возвращаем как строку
@@ -92,6 +136,59 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def _get_pwd_pool() -> ThreadPoolExecutor:
+    """Пул потоков для bcrypt (создаётся при первом вызове)"""
+    global _pwd_pool
+    if _pwd_pool is None:
+        _pwd_pool = ThreadPoolExecutor(
+            max_workers=_PWD_POOL_MAX_WORKERS,
+            thread_name_prefix="bcrypt",
+        )
+    return _pwd_pool
+
+
+def shutdown_password_pool() -> None:
+    """Остановить пул потоков bcrypt (вызывается при остановке приложения)"""
+    global _pwd_pool
+    if _pwd_pool is not None:
+        _pwd_pool.shutdown(wait=True)
+        _pwd_pool = None
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Асинхронная обёртка над hash_password: хеширует в пуле потоков.
+
+    Args:
+        password: Пароль для хеширования
+
+    Returns:
+        Хеш пароля в виде строки
+
+    Raises:
+        ValueError: Если пароль больше 72 байт
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pwd_pool(), hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Асинхронная обёртка над verify_password: проверяет в пуле потоков.
+
+    Args:
+        plain_password: Открытый пароль
+        hashed_password: Хеш пароля
+
+    Returns:
+        True если пароль совпадает, False в противном случае
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_pwd_pool(), verify_password, plain_password, hashed_password
+    )
+
+
 # Создание access токена
 def create_access_token(data: dict) -> str:
     """
@@ -171,16 +268,33 @@ def decode_access_token(token: str) -> dict:
 def decode_refresh_token(token: str) -> dict:
     """
     Декодирует refresh токен JWT.
-    
+
+    Проверка подписи кэшируется для недавно встреченных токенов
+    (повторные refresh при переподключении клиентов), срок действия
+    проверяется при каждом вызове.
+
     Args:
         token: JWT токен для декодирования
-        
+
     Returns:
         Payload токена в виде словаря
-        
+
     Raises:
         jwt.InvalidTokenError: Если токен невалиден или истёк
     """
+    payload = _decode_refresh_token_cached(token)
+
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    # Копия, чтобы вызывающий код не мог изменить закэшированный payload
+    return dict(payload)
+
+
+@lru_cache(maxsize=2048)
+def _decode_refresh_token_cached(token: str) -> dict:
+    """Проверка подписи и декодирование refresh токена (результат кэшируется)"""
     return jwt.decode(
         token,
         settings.REFRESH_TOKEN_SECRET,
@@ -193,15 +307,39 @@ def decode_refresh_token(token: str) -> dict:
     )
 
 
-# Хеширование refresh токена для хранения в БД (SHA-256)
-def hash_refresh_token(token: str) -> str:
+# Парсинг sub из payload токена (кэшируется: одни и те же пользователи приходят часто)
+@lru_cache(maxsize=4096)
+def parse_token_subject(sub: str) -> uuid.UUID:
     """
-    Создаёт SHA-256 хеш токена для безопасного хранения в БД.
-    
+    Преобразует поле sub токена в UUID пользователя.
+
+    Args:
+        sub: Строковое представление UUID из payload
+
+    Returns:
+        UUID пользователя
+
+    Raises:
+        ValueError: Если sub не является валидным UUID
+    """
+    return uuid.UUID(sub)
+
+
+# Хеширование refresh токена для хранения в БД (HMAC-SHA256, 16 байт)
+def hash_refresh_token(token: str) -> bytes:
+    """
+    Создаёт HMAC-SHA256 хеш токена для безопасного хранения в БД.
+
+    Refresh токен сам по себе высокоэнтропийный, поэтому медленный KDF не нужен:
+    достаточно быстрой ключевой PRF. Ключ (pepper) хранится вне БД, так что
+    утечка таблицы не позволяет сопоставить хеши с токенами.
+    Дайджест усечён до 128 бит и хранится как bytea — ключ индекса вчетверо
+    короче hex-строки SHA-256.
+
     Args:
         token: Токен для хеширования
-        
+
     Returns:
-        SHA-256 хеш в hex формате (64 символа)
+        Первые 16 байт HMAC-SHA256
     """
-    return hashlib.sha256(token.encode()).hexdigest()
\ No newline at end of file
+    return hmac.new(_TOKEN_HASH_KEY, token.encode(), hashlib.sha256).digest()[:TOKEN_HASH_BYTES]
@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.exc import IntegrityError
 
 from app.api.v1 import api_router
 from app.core.config import settings
 from app.core.exceptions import DomainException
+from app.core.security import shutdown_password_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Жизненный цикл приложения.
+
+    При остановке завершает пул потоков bcrypt.
+    """
+    yield
+    shutdown_password_pool()
 
 
 def create_app() -> FastAPI:
@@ -22,6 +37,9 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        # orjson рендерит ответы (списки товаров/категорий) быстрее stdlib json
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
 
     # CORS middleware
@@ -1,16 +1,28 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, func, Boolean
+from sqlalchemy import DDL, DateTime, event, func, Boolean
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.database import Base
 
 
+# Триграммные GIN индексы поиска (gin_trgm_ops) требуют расширения pg_trgm.
+# В миграциях расширение создаётся явно, здесь — для metadata.create_all
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
+
 class BaseModel(Base):
     __abstract__ = True
 
+    # Серверные значения (created_at, updated_at, ...) возвращаются
+    # через RETURNING того же INSERT/UPDATE, без отдельного SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
@@ -97,4 +97,16 @@ class Product(BaseModel):
             unique=True,
             postgresql_where=text("sku IS NOT NULL AND is_deleted = false"),
         ),
+        # Триграммные GIN индексы для поиска подстроки (ILIKE '%...%')
+        # по названию и описанию (только для активных)
+        *(
+            Index(
+                f"ix_products_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_where=text("is_deleted = false"),
+            )
+            for column in ("name", "description")
+        ),
     )
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, ForeignKey, Boolean
+from sqlalchemy import String, DateTime, ForeignKey, Boolean, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -19,8 +19,10 @@ class RefreshToken(BaseModel):
 
     __tablename__ = "refresh_tokens"
 
-    token_hash: Mapped[str] = mapped_column(
-        String(255),
+    # HMAC-SHA256, усечённый до 16 байт (bytea вчетверо уже 64-символьного
+    # hex SHA-256, хранившегося раньше)
+    token_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(16),
         unique=True,
         index=True,
         nullable=False,
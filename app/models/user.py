@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 import enum
 
-from sqlalchemy import String, Enum, Boolean
+from sqlalchemy import String, Enum, Boolean, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import BaseModel
@@ -82,3 +82,18 @@ class User(BaseModel):
         cascade="all, delete-orphan",
         lazy="selectin",
     )
+
+    __table_args__ = (
+        # Триграммные GIN индексы для поиска подстроки (ILIKE '%...%')
+        # по email, имени и фамилии (только для активных)
+        *(
+            Index(
+                f"ix_users_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_where=text("is_deleted = false"),
+            )
+            for column in ("email", "first_name", "last_name")
+        ),
+    )
@@ -1,7 +1,7 @@
 import uuid
-from typing import Generic, TypeVar
+from typing import Any, ClassVar, Generic, TypeVar
 
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.base import BaseModel
@@ -17,10 +17,27 @@ class BaseRepository(Generic[ModelType]):
     Автоматически фильтрует is_deleted=False во всех запросах.
     """
 
+    # Опции загрузки, применяемые ко всем SELECT модели (например, отключение
+    # eager-загрузки связей, которые не попадают в ответы API)
+    _load_options: tuple = ()
+
+    # Готовые запросы get_by_id: (модель, include_deleted) → Select.
+    # Строятся при первом вызове, дальше меняется только параметр :id
+    _get_by_id_stmts: ClassVar[dict[tuple[type, bool], Any]] = {}
+
     def __init__(self, model: type[ModelType], db: AsyncSession):
         self.model = model
         self.db = db
 
+    def _select(self):
+        """
+        SELECT модели с опциями загрузки репозитория.
+
+        Returns:
+            Select: Запрос select(self.model) с применёнными _load_options
+        """
+        return select(self.model).options(*self._load_options)
+
     async def get_by_id(
         self,
         id: uuid.UUID,
@@ -36,12 +53,15 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Запись или None
         """
-        query = select(self.model).where(self.model.id == id)
-
-        if not include_deleted:
-            query = query.where(self.model.is_deleted.is_(False))
-
-        result = await self.db.execute(query)
+        key = (self.model, include_deleted)
+        query = self._get_by_id_stmts.get(key)
+        if query is None:
+            query = self._select().where(self.model.id == bindparam("id"))
+            if not include_deleted:
+                query = query.where(self.model.is_deleted.is_(False))
+            self._get_by_id_stmts[key] = query
+
+        result = await self.db.execute(query, {"id": id})
         return result.scalar_one_or_none()
 
     async def get_all(
@@ -61,7 +81,7 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Список записей
         """
-        query = select(self.model)
+        query = self._select()
 
         if not include_deleted:
             query = query.where(self.model.is_deleted.is_(False))
@@ -92,6 +112,9 @@ class BaseRepository(Generic[ModelType]):
         """
         Создать новую запись.
 
+        Серверные значения по умолчанию подставляются в объект из RETURNING
+        при flush (eager_defaults в BaseModel), отдельный refresh не нужен.
+
         Args:
             obj: Объект для создания
 
@@ -100,14 +123,14 @@ class BaseRepository(Generic[ModelType]):
         """
         self.db.add(obj)
         await self.db.flush()
-        await self.db.refresh(obj)
         return obj
 
     async def update(self, id: uuid.UUID, **kwargs) -> ModelType | None:
         """
         Обновить запись по ID.
 
-        Использует ORM-стиль вместо bulk update для поддержания синхронизации сессии.
+        Выполняется одним UPDATE ... RETURNING без предварительного SELECT.
+        populate_existing обновляет объект, если он уже загружен в сессию.
 
         Args:
             id: UUID записи
@@ -116,25 +139,26 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Обновленная запись или None
         """
-        # Загружаем объект через ORM
-        obj = await self.get_by_id(id, include_deleted=False)
-        if obj is None:
-            return None
-
-        # Обновляем атрибуты объекта
-        for key, value in kwargs.items():
-            setattr(obj, key, value)
-
-        # Flush изменений в БД и обновляем объект
-        await self.db.flush()
-        await self.db.refresh(obj)
-        return obj
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.id == id,
+                self.model.is_deleted.is_(False)
+            )
+            .values(**kwargs)
+            .returning(self.model)
+            .options(*self._load_options)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
 
     async def soft_delete(self, id: uuid.UUID) -> bool:
         """
         Мягкое удаление записи (is_deleted = True).
 
-        Использует ORM-стиль вместо bulk update для поддержания синхронизации сессии.
+        Выполняется одним UPDATE ... RETURNING без предварительного SELECT.
+        Загруженные в сессию объекты синхронизируются ORM (synchronize_session).
 
         Args:
             id: UUID записи
@@ -142,17 +166,16 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             True если запись удалена, False если не найдена
         """
-        # Загружаем объект через ORM
-        obj = await self.get_by_id(id, include_deleted=False)
-        if obj is None:
-            return False
-
-        # Помечаем как удаленный
-        obj.is_deleted = True
-
-        # Flush изменений в БД
-        await self.db.flush()
-        return True
+        result = await self.db.execute(
+            update(self.model)
+            .where(
+                self.model.id == id,
+                self.model.is_deleted.is_(False)
+            )
+            .values(is_deleted=True)
+            .returning(self.model.id)
+        )
+        return result.scalar_one_or_none() is not None
 
     async def hard_delete(self, id: uuid.UUID) -> bool:
         """
@@ -1,7 +1,8 @@
 import uuid
 
-from sqlalchemy import select, exists
+from sqlalchemy import select, exists, true, false
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, lazyload
 
 from app.models.category import Category
 from app.repositories.base import BaseRepository
@@ -13,12 +14,20 @@ class CategoryRepository(BaseRepository[Category]):
 
     Наследует базовые CRUD операции и добавляет специфичные методы:
     - Поиск по slug
-    - Проверка существования slug
+    - Проверка существования категории и slug
     - Получение подкатегорий (children)
     - Получение корневых категорий (без parent)
     - Фильтрация по активности
+    - Проверка предков в иерархии (рекурсивный CTE)
+    - Комбинированная проверка перед созданием/обновлением
     """
 
+    # Связи модели объявлены с lazy="selectin", но в ответы API не попадают:
+    # без этой опции каждая загрузка тянет дополнительные SELECT по связям.
+    # Случайное обращение к связи в async-коде упадёт с MissingGreenlet,
+    # а каскады при flush по-прежнему догружают связи
+    _load_options = (lazyload("*"),)
+
     def __init__(self, db: AsyncSession):
         super().__init__(Category, db)
 
@@ -37,7 +46,7 @@ class CategoryRepository(BaseRepository[Category]):
         Returns:
             Категория или None
         """
-        query = select(Category).where(Category.slug == slug)
+        query = self._select().where(Category.slug == slug)
 
         if not include_deleted:
             query = query.where(Category.is_deleted.is_(False))
@@ -45,6 +54,27 @@ class CategoryRepository(BaseRepository[Category]):
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def id_exists(self, category_id: uuid.UUID) -> bool:
+        """
+        Проверить существование (не удалённой) категории по ID.
+
+        В отличие от get_by_id не загружает строку в ORM-объект.
+
+        Args:
+            category_id: ID категории
+
+        Returns:
+            True если категория существует, False иначе
+        """
+        subquery = select(Category.id).where(
+            Category.id == category_id,
+            Category.is_deleted.is_(False)
+        )
+
+        query = select(exists(subquery))
+        result = await self.db.execute(query)
+        return result.scalar()
+
     async def slug_exists(
         self,
         slug: str,
@@ -88,15 +118,20 @@ class CategoryRepository(BaseRepository[Category]):
             parent_id: ID родительской категории
             skip: Количество записей для пропуска
             limit: Максимальное количество записей
-            include_deleted: Включать ли удаленные записи
+            include_deleted: Включать ли удаленные записи. Без него подкатегории
+                возвращаются только если сам родитель не удалён
 
         Returns:
             Список подкатегорий
         """
-        query = select(Category).where(Category.parent_id == parent_id)
+        query = self._select().where(Category.parent_id == parent_id)
 
         if not include_deleted:
-            query = query.where(Category.is_deleted.is_(False))
+            parent = aliased(Category)
+            query = query.where(
+                Category.is_deleted.is_(False),
+                exists().where(parent.id == parent_id, parent.is_deleted.is_(False))
+            )
 
         query = query.offset(skip).limit(limit)
         result = await self.db.execute(query)
@@ -119,7 +154,7 @@ class CategoryRepository(BaseRepository[Category]):
         Returns:
             Список корневых категорий
         """
-        query = select(Category).where(Category.parent_id.is_(None))
+        query = self._select().where(Category.parent_id.is_(None))
 
         if not include_deleted:
             query = query.where(Category.is_deleted.is_(False))
@@ -143,7 +178,7 @@ class CategoryRepository(BaseRepository[Category]):
         Returns:
             Список активных категорий
         """
-        query = select(Category).where(
+        query = self._select().where(
             Category.is_active.is_(True),
             Category.is_deleted.is_(False)
         )
@@ -189,3 +224,96 @@ class CategoryRepository(BaseRepository[Category]):
         query = select(exists(subquery))
         result = await self.db.execute(query)
         return result.scalar()
+
+    async def is_ancestor(
+        self,
+        candidate_ancestor_id: uuid.UUID,
+        start_id: uuid.UUID
+    ) -> bool:
+        """
+        Проверить, входит ли категория в цепочку предков start_id (включая её саму).
+
+        Вся цепочка parent_id разворачивается одним рекурсивным CTE на стороне БД
+        вместо отдельного запроса на каждый уровень иерархии.
+        Удалённые категории обрывают цепочку.
+
+        Args:
+            candidate_ancestor_id: ID категории, которую ищем среди предков
+            start_id: ID категории, от которой поднимаемся вверх
+
+        Returns:
+            True если candidate_ancestor_id найден в цепочке, False иначе
+        """
+        ancestors = (
+            select(Category.id, Category.parent_id)
+            .where(Category.id == start_id, Category.is_deleted.is_(False))
+            .cte("ancestors", recursive=True)
+        )
+
+        parent = aliased(Category)
+        # UNION (а не UNION ALL) — защита от зацикливания на уже испорченных данных
+        ancestors = ancestors.union(
+            select(parent.id, parent.parent_id)
+            .join(ancestors, parent.id == ancestors.c.parent_id)
+            .where(parent.is_deleted.is_(False))
+        )
+
+        query = select(exists().where(ancestors.c.id == candidate_ancestor_id))
+        result = await self.db.execute(query)
+        return result.scalar()
+
+    async def validate_create(
+        self,
+        slug: str | None,
+        name: str | None,
+        parent_id: uuid.UUID | None,
+        exclude_category_id: uuid.UUID | None = None,
+        check_parent: bool = True
+    ) -> tuple[bool, bool, bool]:
+        """
+        Проверить slug, имя и родителя одним запросом.
+
+        Заменяет последовательные slug_exists, name_exists_in_parent и get_by_id(parent):
+        все три EXISTS вычисляются в одной строке результата.
+
+        Args:
+            slug: Slug для проверки (None — не проверять)
+            name: Имя категории (None — не проверять)
+            parent_id: ID родителя (None для корневых)
+            exclude_category_id: ID категории для исключения (для обновления)
+            check_parent: Проверять ли существование родителя
+
+        Returns:
+            Кортеж (slug_taken, name_taken, parent_ok)
+        """
+        live = Category.is_deleted.is_(False)
+        excluded = (
+            Category.id != exclude_category_id if exclude_category_id else true()
+        )
+
+        slug_taken = (
+            exists().where(Category.slug == slug, live, excluded)
+            if slug is not None else false()
+        )
+        name_taken = (
+            exists().where(
+                Category.name == name,
+                Category.parent_id.is_not_distinct_from(parent_id),
+                live,
+                excluded,
+            )
+            if name is not None else false()
+        )
+        parent_ok = (
+            exists().where(Category.id == parent_id, live)
+            if check_parent and parent_id is not None else true()
+        )
+
+        query = select(
+            slug_taken.label("slug_taken"),
+            name_taken.label("name_taken"),
+            parent_ok.label("parent_ok"),
+        )
+        result = await self.db.execute(query)
+        row = result.one()
+        return row.slug_taken, row.name_taken, row.parent_ok
@@ -1,8 +1,10 @@
 import uuid
 
-from sqlalchemy import select, or_, exists, update
+from sqlalchemy import select, or_, exists, update, true, false
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, lazyload
 
+from app.models.category import Category
 from app.models.product import Product
 from app.repositories.base import BaseRepository
 
@@ -17,8 +19,15 @@ class ProductRepository(BaseRepository[Product]):
     - Получение по категории
     - Фильтрация по активности и остаткам
     - Поиск по названию
+    - Комбинированная проверка перед созданием/обновлением
     """
 
+    # Связи модели объявлены с lazy="selectin", но в ответы API не попадают:
+    # без этой опции каждая загрузка тянет дополнительные SELECT по связям.
+    # Случайное обращение к связи в async-коде упадёт с MissingGreenlet,
+    # а каскады при flush по-прежнему догружают связи
+    _load_options = (lazyload("*"),)
+
     def __init__(self, db: AsyncSession):
         super().__init__(Product, db)
 
@@ -37,7 +46,7 @@ class ProductRepository(BaseRepository[Product]):
         Returns:
             Продукт или None
         """
-        query = select(Product).where(Product.slug == slug)
+        query = self._select().where(Product.slug == slug)
 
         if not include_deleted:
             query = query.where(Product.is_deleted.is_(False))
@@ -60,7 +69,7 @@ class ProductRepository(BaseRepository[Product]):
         Returns:
             Продукт или None
         """
-        query = select(Product).where(Product.sku == sku)
+        query = self._select().where(Product.sku == sku)
 
         if not include_deleted:
             query = query.where(Product.is_deleted.is_(False))
@@ -126,6 +135,55 @@ class ProductRepository(BaseRepository[Product]):
         result = await self.db.execute(query)
         return result.scalar()
 
+    async def preflight_create(
+        self,
+        category_id: uuid.UUID | None,
+        slug: str | None,
+        sku: str | None,
+        exclude_product_id: uuid.UUID | None = None
+    ) -> tuple[bool, bool, bool]:
+        """
+        Проверить категорию, slug и SKU одним запросом.
+
+        Заменяет последовательные get_by_id(category), slug_exists и sku_exists:
+        все три EXISTS вычисляются в одной строке результата.
+
+        Args:
+            category_id: ID категории (None — не проверять)
+            slug: Slug для проверки (None — не проверять)
+            sku: SKU для проверки (None — не проверять)
+            exclude_product_id: ID продукта для исключения (для обновления)
+
+        Returns:
+            Кортеж (category_ok, slug_taken, sku_taken)
+        """
+        live = Product.is_deleted.is_(False)
+        excluded = (
+            Product.id != exclude_product_id if exclude_product_id else true()
+        )
+
+        category_ok = (
+            exists().where(Category.id == category_id, Category.is_deleted.is_(False))
+            if category_id is not None else true()
+        )
+        slug_taken = (
+            exists().where(Product.slug == slug, live, excluded)
+            if slug is not None else false()
+        )
+        sku_taken = (
+            exists().where(Product.sku == sku, live, excluded)
+            if sku is not None else false()
+        )
+
+        query = select(
+            category_ok.label("category_ok"),
+            slug_taken.label("slug_taken"),
+            sku_taken.label("sku_taken"),
+        )
+        result = await self.db.execute(query)
+        row = result.one()
+        return row.category_ok, row.slug_taken, row.sku_taken
+
     async def get_by_category(
         self,
         category_id: uuid.UUID,
@@ -145,7 +203,7 @@ class ProductRepository(BaseRepository[Product]):
         Returns:
             Список продуктов в категории
         """
-        query = select(Product).where(Product.category_id == category_id)
+        query = self._select().where(Product.category_id == category_id)
 
         if not include_deleted:
             query = query.where(Product.is_deleted.is_(False))
@@ -169,7 +227,7 @@ class ProductRepository(BaseRepository[Product]):
         Returns:
             Список активных продуктов
         """
-        query = select(Product).where(
+        query = self._select().where(
             Product.is_active.is_(True),
             Product.is_deleted.is_(False)
         )
@@ -197,7 +255,7 @@ class ProductRepository(BaseRepository[Product]):
         Returns:
             Список найденных продуктов
         """
-        query = select(Product).where(
+        query = self._select().where(
             Product.name.ilike(f"%{search_term}%")
         )
 
@@ -225,7 +283,7 @@ class ProductRepository(BaseRepository[Product]):
         Returns:
             Список продуктов с остатком <= threshold
         """
-        query = select(Product).where(
+        query = self._select().where(
             Product.stock_quantity <= threshold,
             Product.is_deleted.is_(False)
         )
@@ -249,7 +307,7 @@ class ProductRepository(BaseRepository[Product]):
         Returns:
             Список продуктов с stock_quantity = 0
         """
-        query = select(Product).where(
+        query = self._select().where(
             Product.stock_quantity == 0,
             Product.is_deleted.is_(False)
         )
@@ -273,7 +331,7 @@ class ProductRepository(BaseRepository[Product]):
         Комплексный поиск продуктов с фильтрами.
 
         Args:
-            search_term: Поиск по названию или описанию
+            search_term: Поиск подстроки в названии или описании (регистронезависимый)
             category_id: Фильтр по категории
             min_price: Минимальная цена
             max_price: Максимальная цена
@@ -285,9 +343,10 @@ class ProductRepository(BaseRepository[Product]):
         Returns:
             Список найденных продуктов
         """
-        query = select(Product).where(Product.is_deleted.is_(False))
+        query = self._select().where(Product.is_deleted.is_(False))
 
-        # Поиск по названию или описанию
+        # Поиск по названию или описанию: от 3 символов ILIKE
+        # обслуживается триграммными GIN индексами (ix_products_*_trgm)
         if search_term:
             query = query.where(
                 or_(
@@ -322,7 +381,7 @@ class ProductRepository(BaseRepository[Product]):
         self,
         product_id: uuid.UUID,
         quantity_delta: int
-    ) -> Product | None:
+    ) -> tuple[Product | None, int | None]:
         """
         Атомарное обновление остатка товара (thread-safe, race condition safe).
 
@@ -330,21 +389,32 @@ class ProductRepository(BaseRepository[Product]):
         с проверкой что результат >= 0. Это гарантирует что при конкурентной
         нагрузке не произойдет oversell (продажа больше чем есть).
 
+        UPDATE выполняется в data-modifying CTE, а в том же запросе читается
+        остаток до изменения — отличить "не найден" от "недостаточно товара"
+        можно без повторного SELECT.
+
         Args:
             product_id: ID продукта
             quantity_delta: Изменение количества (может быть отрицательным)
 
         Returns:
-            Product | None: Обновленный продукт или None если:
-                - продукт не найден
-                - недостаточно товара (stock_quantity + delta < 0)
+            tuple[Product | None, int | None]: (обновленный продукт, остаток до изменения):
+                - (product, stock) — остаток обновлен
+                - (None, stock) — недостаточно товара (stock_quantity + delta < 0)
+                - (None, None) — продукт не найден
         """
-        # UPDATE products
-        # SET stock_quantity = stock_quantity + quantity_delta
-        # WHERE id = product_id
-        #   AND is_deleted = False
-        #   AND stock_quantity + quantity_delta >= 0
-        stmt = (
+        # WITH updated AS (
+        #     UPDATE products
+        #     SET stock_quantity = stock_quantity + quantity_delta
+        #     WHERE id = product_id
+        #       AND is_deleted = False
+        #       AND stock_quantity + quantity_delta >= 0
+        #     RETURNING *
+        # )
+        # SELECT updated.*, current.stock_quantity
+        # FROM (SELECT stock_quantity FROM products WHERE id = product_id ...) AS current
+        # LEFT JOIN updated ON true
+        updated = (
             update(Product)
             .where(
                 Product.id == product_id,
@@ -353,11 +423,31 @@ class ProductRepository(BaseRepository[Product]):
                 Product.stock_quantity + quantity_delta >= 0
             )
             .values(stock_quantity=Product.stock_quantity + quantity_delta)
-            .returning(Product)
+            .returning(*Product.__table__.columns)
+            .cte("updated")
+        )
+        # Остальные части запроса видят снимок данных до UPDATE
+        current = (
+            select(Product.stock_quantity)
+            .where(
+                Product.id == product_id,
+                Product.is_deleted.is_(False)
+            )
+            .subquery("current")
+        )
+        updated_product = aliased(Product, updated)
+
+        query = (
+            select(updated_product, current.c.stock_quantity)
+            .select_from(current)
+            .outerjoin(updated_product, true())
+            .options(*self._load_options)
+            .execution_options(populate_existing=True)
         )
 
-        result = await self.db.execute(stmt)
-        await self.db.flush()
+        result = await self.db.execute(query)
+        row = result.one_or_none()
+        if row is None:
+            return None, None
 
-        # Возвращаем обновленный продукт или None если update не выполнился
-        return result.scalar_one_or_none()
+        return row[0], row[1]
@@ -1,13 +1,39 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import select, update, delete, and_, exists
+from sqlalchemy import select, update, delete, and_, exists, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.refresh_token import RefreshToken
 from app.repositories.base import BaseRepository
 
 
+# Отзыв старого токена и вставка нового одним выражением.
+# INSERT выполняется только если UPDATE действительно отозвал живой токен,
+# поэтому проверка и отзыв атомарны (нет гонки между is_token_valid и revoke_token)
+_ROTATE_STMT = text("""
+    WITH revoked AS (
+        UPDATE refresh_tokens
+        SET is_revoked = true, updated_at = now()
+        WHERE token_hash = :token_hash
+          AND user_id = :user_id
+          AND is_revoked = false
+          AND is_deleted = false
+          AND expires_at > now()
+        RETURNING id
+    )
+    INSERT INTO refresh_tokens (id, token_hash, user_id, expires_at, device_info)
+    SELECT
+        CAST(:new_id AS uuid),
+        CAST(:new_token_hash AS bytea),
+        CAST(:user_id AS uuid),
+        CAST(:new_expires_at AS timestamptz),
+        CAST(:new_device_info AS varchar)
+    WHERE EXISTS (SELECT 1 FROM revoked)
+    RETURNING id
+""")
+
+
 class RefreshTokenRepository(BaseRepository[RefreshToken]):
     """
     Репозиторий для работы с refresh токенами.
@@ -16,6 +42,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
     - Поиск по хешу токена
     - Получение токенов пользователя
     - Отзыв токенов (revoke)
+    - Ротация токена (отзыв старого + создание нового одним запросом)
     - Очистка истекших токенов
     - Проверка валидности токена
     """
@@ -25,7 +52,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
 
     async def get_by_token_hash(
         self,
-        token_hash: str,
+        token_hash: bytes,
         include_revoked: bool = False,
         include_deleted: bool = False
     ) -> RefreshToken | None:
@@ -33,7 +60,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
         Получить refresh токен по хешу.
 
         Args:
-            token_hash: SHA-256 хеш токена
+            token_hash: HMAC хеш токена
             include_revoked: Включать ли отозванные токены
             include_deleted: Включать ли удаленные записи
 
@@ -81,13 +108,13 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
 
     async def is_token_valid(
         self,
-        token_hash: str
+        token_hash: bytes
     ) -> bool:
         """
         Проверить валидность токена (не истек, не отозван, не удален).
 
         Args:
-            token_hash: SHA-256 хеш токена
+            token_hash: HMAC хеш токена
 
         Returns:
             True если токен валиден, False если нет
@@ -109,7 +136,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
 
     async def revoke_token(
         self,
-        token_hash: str
+        token_hash: bytes
     ) -> bool:
         """
         Отозвать токен по хешу.
@@ -117,7 +144,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
         ПРИМЕЧАНИЕ: Использует bulk update для производительности (не требует загрузки объекта).
 
         Args:
-            token_hash: SHA-256 хеш токена
+            token_hash: HMAC хеш токена
 
         Returns:
             True если токен отозван, False если не найден
@@ -133,6 +160,41 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
         await self.db.flush()
         return result.rowcount > 0
 
+    async def rotate(
+        self,
+        token_hash: bytes,
+        user_id: uuid.UUID,
+        new_token: RefreshToken
+    ) -> bool:
+        """
+        Ротация refresh токена за один запрос к БД.
+
+        Отзывает действующий токен пользователя и, только если отзыв удался,
+        сохраняет новый. Заменяет цепочку get_by_token_hash → is_token_valid →
+        revoke_token → create.
+
+        Args:
+            token_hash: HMAC хеш старого токена
+            user_id: UUID владельца токена
+            new_token: Новый токен (ещё не добавленный в сессию)
+
+        Returns:
+            True если старый токен был валиден и заменён, False если не найден,
+            отозван, истёк или принадлежит другому пользователю
+        """
+        result = await self.db.execute(
+            _ROTATE_STMT,
+            {
+                "token_hash": token_hash,
+                "user_id": user_id,
+                "new_id": new_token.id,
+                "new_token_hash": new_token.token_hash,
+                "new_expires_at": new_token.expires_at,
+                "new_device_info": new_token.device_info,
+            },
+        )
+        return result.scalar_one_or_none() is not None
+
     async def revoke_all_user_tokens(
         self,
         user_id: uuid.UUID
@@ -1,12 +1,31 @@
 import uuid
+from typing import Any, AsyncIterator
 
-from sqlalchemy import select, or_, exists
+from sqlalchemy import select, update, or_, literal, literal_column
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, lazyload
 
+from app.models.refresh_token import RefreshToken
 from app.models.user import User, UserRole
 from app.repositories.base import BaseRepository
 
 
+# Часто используемые условия фильтрации (строятся один раз при импорте)
+_LIVE = User.is_deleted.is_(False)
+_ACTIVE = User.is_active.is_(True)
+_VERIFIED = User.is_verified.is_(True)
+
+# User.refresh_tokens объявлена с lazy="selectin", но в ответы API не попадает:
+# без этой опции каждый список пользователей догружает все их токены
+_LOAD_OPTIONS = (lazyload("*"),)
+
+# Базовый запрос списка пользователей без фильтров (самый частый вызов
+# админского списка): SQLAlchemy кеширует его компиляцию, меняются только
+# параметры skip/limit
+_FILTER_NONE_STMT = select(User).options(*_LOAD_OPTIONS).where(_LIVE).order_by(User.id)
+
+
 class UserRepository(BaseRepository[User]):
     """
     Репозиторий для работы с пользователями.
@@ -16,8 +35,11 @@ class UserRepository(BaseRepository[User]):
     - Проверка существования email
     - Поиск по роли
     - Фильтрация по статусам (активные, верифицированные)
+    - Атомарные операции над пользователем вместе с его refresh токенами
     """
 
+    _load_options = _LOAD_OPTIONS
+
     def __init__(self, db: AsyncSession):
         super().__init__(User, db)
 
@@ -36,11 +58,59 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Пользователь или None
         """
-        query = select(User).where(User.email == email)
+        query = self._select().where(User.email == email)
 
         if not include_deleted:
-            query = query.where(User.is_deleted.is_(False))
+            query = query.where(_LIVE)
+
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def create_with_refresh_token(
+        self,
+        refresh_token: RefreshToken,
+        **values: Any
+    ) -> User | None:
+        """
+        Создать пользователя вместе с первым refresh токеном одним запросом.
+
+        Обе вставки — data-modifying CTE одного выражения: токен вставляется
+        только для реально созданной строки users (ON CONFLICT (email) DO NOTHING).
+
+        Args:
+            refresh_token: Refresh токен нового пользователя (ещё не в сессии)
+            **values: Значения колонок нового пользователя
 
+        Returns:
+            Созданный пользователь или None, если email уже существует
+        """
+        new_user = (
+            insert(User)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(*User.__table__.columns)
+            .cte("new_user")
+        )
+        new_token = (
+            insert(RefreshToken)
+            .from_select(
+                ["id", "token_hash", "user_id", "expires_at", "device_info"],
+                select(
+                    literal(refresh_token.id, RefreshToken.id.type),
+                    literal(refresh_token.token_hash, RefreshToken.token_hash.type),
+                    new_user.c.id,
+                    literal(refresh_token.expires_at, RefreshToken.expires_at.type),
+                    literal(refresh_token.device_info, RefreshToken.device_info.type),
+                ),
+            )
+            .cte("new_token")
+        )
+
+        query = (
+            select(aliased(User, new_user))
+            .options(*_LOAD_OPTIONS)
+            .add_cte(new_token)
+        )
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
@@ -59,17 +129,17 @@ class UserRepository(BaseRepository[User]):
         Returns:
             True если email существует, False если свободен
         """
-        # Создаем подзапрос для exists
-        subquery = select(User.id).where(
+        # SELECT EXISTS (SELECT 1 FROM users WHERE ... LIMIT 1):
+        # колонки не нужны, достаточно первой найденной строки по индексу email
+        subquery = select(literal_column("1")).where(
             User.email == email,
-            User.is_deleted.is_(False)
+            _LIVE
         )
 
         if exclude_user_id:
             subquery = subquery.where(User.id != exclude_user_id)
 
-        # Используем exists() для проверки
-        query = select(exists(subquery))
+        query = select(subquery.limit(1).exists())
         result = await self.db.execute(query)
         return result.scalar()
 
@@ -92,15 +162,44 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Список пользователей с указанной ролью
         """
-        query = select(User).where(User.role == role)
+        query = self._select().where(User.role == role)
 
         if not include_deleted:
-            query = query.where(User.is_deleted.is_(False))
+            query = query.where(_LIVE)
 
         query = query.offset(skip).limit(limit)
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def iter_by_role_chunks(
+        self,
+        role: UserRole,
+        chunk_size: int = 1000
+    ) -> AsyncIterator[list[User]]:
+        """
+        Потоково выдать пользователей с указанной ролью порциями.
+
+        Для выгрузок большого объёма: строки читаются с сервера курсором
+        (yield_per), в памяти одновременно держится не больше chunk_size объектов.
+
+        Args:
+            role: Роль пользователя (CUSTOMER/ADMIN)
+            chunk_size: Размер порции
+
+        Yields:
+            Списки пользователей длиной не больше chunk_size
+        """
+        query = (
+            self._select()
+            .where(User.role == role, _LIVE)
+            .order_by(User.id)
+            .execution_options(yield_per=chunk_size)
+        )
+
+        result = await self.db.stream_scalars(query)
+        async for chunk in result.partitions(chunk_size):
+            yield list(chunk)
+
     async def get_active_users(
         self,
         skip: int = 0,
@@ -116,10 +215,7 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Список активных пользователей
         """
-        query = select(User).where(
-            User.is_active.is_(True),
-            User.is_deleted.is_(False)
-        )
+        query = self._select().where(_ACTIVE, _LIVE)
 
         query = query.offset(skip).limit(limit)
         result = await self.db.execute(query)
@@ -140,10 +236,7 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Список верифицированных пользователей
         """
-        query = select(User).where(
-            User.is_verified.is_(True),
-            User.is_deleted.is_(False)
-        )
+        query = self._select().where(_VERIFIED, _LIVE)
 
         query = query.offset(skip).limit(limit)
         result = await self.db.execute(query)
@@ -165,12 +258,19 @@ class UserRepository(BaseRepository[User]):
             limit: Максимальное количество записей
             is_active: Фильтр по статусу активности (опционально)
             role: Фильтр по роли (опционально)
-            search: Поиск по email, first_name, last_name (опционально, регистронезависимый)
+            search: Поиск подстроки по email, first_name, last_name
+                (опционально, регистронезависимый)
 
         Returns:
             Список пользователей, соответствующих фильтрам
         """
-        query = select(User).where(User.is_deleted.is_(False))
+        # Быстрый путь: фильтры не заданы
+        if is_active is None and role is None and not search:
+            query = _FILTER_NONE_STMT.offset(skip).limit(limit)
+            result = await self.db.execute(query)
+            return list(result.scalars().all())
+
+        query = _FILTER_NONE_STMT
 
         # Фильтр по is_active
         if is_active is not None:
@@ -180,7 +280,8 @@ class UserRepository(BaseRepository[User]):
         if role is not None:
             query = query.where(User.role == role)
 
-        # Поиск по email, first_name, last_name
+        # Поиск по email, first_name, last_name: от 3 символов ILIKE
+        # обслуживается триграммными GIN индексами (ix_users_*_trgm)
         if search:
             search_term = f"%{search}%"
             query = query.where(
@@ -194,3 +295,68 @@ class UserRepository(BaseRepository[User]):
         query = query.offset(skip).limit(limit)
         result = await self.db.execute(query)
         return list(result.scalars().all())
+
+    async def soft_delete_with_tokens(self, user_id: uuid.UUID) -> bool:
+        """
+        Soft delete пользователя и отзыв всех его refresh токенов одним запросом.
+
+        Отзыв токенов выполняется в data-modifying CTE того же UPDATE,
+        поэтому обе операции атомарны и занимают один round trip.
+
+        Args:
+            user_id: UUID пользователя
+
+        Returns:
+            True если пользователь удалён, False если не найден или уже удалён
+        """
+        query = (
+            update(User)
+            .where(User.id == user_id, _LIVE)
+            .values(is_deleted=True)
+            .returning(User.id)
+            .add_cte(self._revoke_tokens_cte(user_id))
+        )
+        result = await self.db.execute(query)
+        await self.db.flush()
+        return result.scalar_one_or_none() is not None
+
+    async def set_password_and_revoke_tokens(
+        self,
+        user_id: uuid.UUID,
+        hashed_password: str
+    ) -> bool:
+        """
+        Обновить хеш пароля и отозвать все refresh токены одним запросом.
+
+        Args:
+            user_id: UUID пользователя
+            hashed_password: Новый bcrypt хеш пароля
+
+        Returns:
+            True если пароль обновлён, False если пользователь не найден
+        """
+        query = (
+            update(User)
+            .where(User.id == user_id, _LIVE)
+            .values(hashed_password=hashed_password)
+            .returning(User.id)
+            .add_cte(self._revoke_tokens_cte(user_id))
+        )
+        result = await self.db.execute(query)
+        await self.db.flush()
+        return result.scalar_one_or_none() is not None
+
+    @staticmethod
+    def _revoke_tokens_cte(user_id: uuid.UUID):
+        """CTE отзыва всех действующих refresh токенов пользователя"""
+        return (
+            update(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.is_revoked.is_(False),
+                RefreshToken.is_deleted.is_(False),
+            )
+            .values(is_revoked=True)
+            .returning(RefreshToken.id)
+            .cte("revoked_tokens")
+        )
@@ -1,30 +1,27 @@
 from typing import Literal
 
-from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from app.utils.validators import validate_password_strength
 from app.schemas.user import UserResponse
-from app.schemas.common import MessageResponse
+from app.schemas.common import MessageResponse, StrictRequest, StrippedStr, StrippedEmailStr
 
 
 # Схема для регистрации
-class RegisterRequest(BaseModel):
+class RegisterRequest(StrictRequest):
     """Схема запроса регистрации"""
-    email: EmailStr
-    password: str = Field(..., min_length=8, max_length=72)
-    first_name: str = Field(..., min_length=1, max_length=100)
-    last_name: str = Field(..., min_length=1, max_length=100)
-    phone: str | None = Field(
+    email: StrippedEmailStr
+    # Пароль обрезается как и раньше (str_strip_whitespace): пользователи,
+    # зарегистрированные с пробелами вокруг пароля, хранятся с хешем обрезанного
+    password: StrippedStr = Field(..., min_length=8, max_length=72)
+    first_name: StrippedStr = Field(..., min_length=1, max_length=100)
+    last_name: StrippedStr = Field(..., min_length=1, max_length=100)
+    phone: StrippedStr | None = Field(
         None,
         max_length=20,
         pattern=r"^\+?[0-9\-() ]{7,20}$",
     )
 
-    model_config = ConfigDict(
-        extra="forbid",
-        str_strip_whitespace=True,  # обрежет пробелы вокруг строк
-    )
-
     @field_validator("password")
     @classmethod
     def validate_password(cls, v: str) -> str:
@@ -32,15 +29,11 @@ class RegisterRequest(BaseModel):
 
 
 # Схема для входа
-class LoginRequest(BaseModel):
+class LoginRequest(StrictRequest):
     """Схема запроса входа"""
-    email: EmailStr
-    password: str
-
-    model_config = ConfigDict(
-        extra="forbid",
-        str_strip_whitespace=True,
-    )
+    email: StrippedEmailStr
+    # Обрезается так же, как при регистрации, иначе хеш не совпадёт
+    password: StrippedStr
 
 
 # Схема ответа с токенами
@@ -56,14 +49,9 @@ class TokenResponse(BaseModel):
 
 
 # Схема для refresh токена
-class RefreshTokenRequest(BaseModel):
+class RefreshTokenRequest(StrictRequest):
     """Схема запроса обновления токена"""
-    refresh_token: str
-
-    model_config = ConfigDict(
-        extra="forbid",
-        str_strip_whitespace=True,
-    )
+    refresh_token: StrippedStr
 
 
 # Схема ответа с пользователем и токенами
@@ -3,6 +3,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from app.schemas.common import StrictRequest, StrippedStr
 from app.utils.validators import validate_slug
 
 
@@ -10,23 +11,18 @@ from app.utils.validators import validate_slug
 class CategoryBase(BaseModel):
     """Базовая схема категории"""
 
-    name: str = Field(..., min_length=1, max_length=255)
-    slug: str = Field(..., min_length=1, max_length=255)
-    description: str | None = Field(None, max_length=1000)
+    name: StrippedStr = Field(..., min_length=1, max_length=255)
+    slug: StrippedStr = Field(..., min_length=1, max_length=255)
+    description: StrippedStr | None = Field(None, max_length=1000)
 
 
 # Схема для создания категории
-class CategoryCreate(CategoryBase):
+class CategoryCreate(CategoryBase, StrictRequest):
     """Схема для создания категории"""
 
     parent_id: uuid.UUID | None = None
     is_active: bool = True
 
-    model_config = ConfigDict(
-        extra="forbid",
-        str_strip_whitespace=True,
-    )
-
     @field_validator("slug")
     @classmethod
     def validate_slug_format(cls, v: str) -> str:
@@ -34,20 +30,15 @@ class CategoryCreate(CategoryBase):
 
 
 # Схема для обновления категории
-class CategoryUpdate(BaseModel):
+class CategoryUpdate(StrictRequest):
     """Схема для обновления категории"""
 
-    name: str | None = Field(None, min_length=1, max_length=255)
-    slug: str | None = Field(None, min_length=1, max_length=255)
-    description: str | None = Field(None, max_length=1000)
+    name: StrippedStr | None = Field(None, min_length=1, max_length=255)
+    slug: StrippedStr | None = Field(None, min_length=1, max_length=255)
+    description: StrippedStr | None = Field(None, max_length=1000)
     parent_id: uuid.UUID | None = None
     is_active: bool | None = None
 
-    model_config = ConfigDict(
-        extra="forbid",
-        str_strip_whitespace=True,
-    )
-
     @field_validator("slug")
     @classmethod
     def validate_slug_format(cls, v: str | None) -> str | None:
@@ -1,4 +1,32 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Annotated, Any
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, EmailStr, StringConstraints
+
+
+def _strip(value: Any) -> Any:
+    """Обрезает пробелы вокруг строки, остальные значения не трогает"""
+    return value.strip() if isinstance(value, str) else value
+
+
+# Строки, в которые пользователь может случайно добавить пробелы (имена, slug,
+# описания, URL изображений, телефон). Обрезка задаётся точечно на уровне
+# полей; пароли регистрации/логина и refresh токен обрезаются для
+# совместимости с уже сохранёнными хешами
+StrippedStr = Annotated[str, StringConstraints(strip_whitespace=True)]
+StrippedEmailStr = Annotated[EmailStr, BeforeValidator(_strip)]
+
+
+class StrictRequest(BaseModel):
+    """
+    Базовая схема входящих запросов.
+
+    Запрещает лишние поля. Обрезка пробелов здесь намеренно не включена —
+    она задаётся на уровне полей через StrippedStr/StrippedEmailStr.
+    """
+
+    model_config = ConfigDict(
+        extra="forbid",
+    )
 
 
 class MessageResponse(BaseModel):
@@ -11,32 +11,28 @@ from app.utils.validators import (
     validate_non_negative_int,
 )
 from app.schemas.category import CategoryShort
+from app.schemas.common import StrictRequest, StrippedStr
 
 
 # Базовая схема с общими полями
 class ProductBase(BaseModel):
     """Базовая схема продукта"""
 
-    name: str = Field(..., min_length=1, max_length=255)
-    slug: str = Field(..., min_length=1, max_length=255)
-    description: str | None = Field(None, max_length=2000)
+    name: StrippedStr = Field(..., min_length=1, max_length=255)
+    slug: StrippedStr = Field(..., min_length=1, max_length=255)
+    description: StrippedStr | None = Field(None, max_length=2000)
     price: Decimal = Field(..., gt=0)
     category_id: uuid.UUID
     stock_quantity: int = Field(default=0, ge=0)
-    sku: str | None = Field(None, max_length=100)
-    image_url: str | None = Field(None, max_length=500)
+    sku: StrippedStr | None = Field(None, max_length=100)
+    image_url: StrippedStr | None = Field(None, max_length=500)
     is_active: bool = True
 
 
 # Схема для создания продукта
-class ProductCreate(ProductBase):
+class ProductCreate(ProductBase, StrictRequest):
     """Схема для создания продукта"""
 
-    model_config = ConfigDict(
-        extra="forbid",
-        str_strip_whitespace=True,
-    )
-
     @field_validator("slug")
     @classmethod
     def validate_slug_format(cls, v: str) -> str:
@@ -55,30 +51,25 @@ class ProductCreate(ProductBase):
     @field_validator("image_url")
     @classmethod
     def validate_image_url_format(cls, v: str | None) -> str | None:
-        if v is not None and v.strip():
+        if v:
             return validate_url(v)
         return v
 
 
 # Схема для обновления продукта
-class ProductUpdate(BaseModel):
+class ProductUpdate(StrictRequest):
     """Схема для обновления продукта"""
 
-    name: str | None = Field(None, min_length=1, max_length=255)
-    slug: str | None = Field(None, min_length=1, max_length=255)
-    description: str | None = Field(None, max_length=2000)
+    name: StrippedStr | None = Field(None, min_length=1, max_length=255)
+    slug: StrippedStr | None = Field(None, min_length=1, max_length=255)
+    description: StrippedStr | None = Field(None, max_length=2000)
     price: Decimal | None = Field(None, gt=0)
     category_id: uuid.UUID | None = None
     stock_quantity: int | None = Field(None, ge=0)
-    sku: str | None = Field(None, max_length=100)
-    image_url: str | None = Field(None, max_length=500)
+    sku: StrippedStr | None = Field(None, max_length=100)
+    image_url: StrippedStr | None = Field(None, max_length=500)
     is_active: bool | None = None
 
-    model_config = ConfigDict(
-        extra="forbid",
-        str_strip_whitespace=True,
-    )
-
     @field_validator("slug")
     @classmethod
     def validate_slug_format(cls, v: str | None) -> str | None:
@@ -103,7 +94,7 @@ class ProductUpdate(BaseModel):
     @field_validator("image_url")
     @classmethod
     def validate_image_url_format(cls, v: str | None) -> str | None:
-        if v is not None and v.strip():
+        if v:
             return validate_url(v)
         return v
 
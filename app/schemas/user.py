@@ -5,6 +5,7 @@ from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator
 
 from app.models.user import UserRole
 from app.utils.validators import validate_password_strength
+from app.schemas.common import StrictRequest
 
 
 # Base schema с общими полями
@@ -21,12 +22,10 @@ class UserBase(BaseModel):
 
 
 # Схема для создания пользователя
-class UserCreate(UserBase):
+class UserCreate(UserBase, StrictRequest):
     """Схема для создания пользователя"""
     password: str = Field(..., min_length=8, max_length=72)
 
-    model_config = ConfigDict(extra="forbid")
-
     @field_validator("password")
     @classmethod
     def validate_password(cls, v: str) -> str:
@@ -34,16 +33,14 @@ class UserCreate(UserBase):
 
 
 # Схема для логина
-class UserLogin(BaseModel):
+class UserLogin(StrictRequest):
     """Схема для логина пользователя"""
     email: EmailStr
     password: str
 
-    model_config = ConfigDict(extra="forbid")
-
 
 # Схема для обновления пользователя
-class UserUpdate(BaseModel):
+class UserUpdate(StrictRequest):
     """Схема для обновления пользователя"""
     first_name: str | None = Field(None, min_length=1, max_length=100)
     last_name: str | None = Field(None, min_length=1, max_length=100)
@@ -53,18 +50,13 @@ class UserUpdate(BaseModel):
         pattern=r"^\+?[0-9\-() ]{7,20}$",
     )
 
-    # validate_assignment убрал — обычно схемы не мутируют после создания
-    model_config = ConfigDict(extra="forbid")
-
 
 # Схема для изменения пароля
-class UserPasswordChange(BaseModel):
+class UserPasswordChange(StrictRequest):
     """Схема для изменения пароля"""
     old_password: str
     new_password: str = Field(..., min_length=8)
 
-    model_config = ConfigDict(extra="forbid")
-
     @field_validator("new_password")
     @classmethod
     def validate_new_password(cls, v: str) -> str:
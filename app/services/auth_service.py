@@ -2,15 +2,15 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError
 
 from app.core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     decode_refresh_token,
     hash_refresh_token,
+    parse_token_subject,
 )
 from app.core.config import settings
 from app.core.exceptions import (
@@ -21,7 +21,6 @@ from app.core.exceptions import (
     InvalidTokenError,
     RefreshTokenNotFoundError,
 )
-from app.models.user import User
 from app.models.refresh_token import RefreshToken
 from app.repositories.user import UserRepository
 from app.repositories.refresh_token import RefreshTokenRepository
@@ -29,6 +28,10 @@ from app.schemas.auth import RegisterRequest, LoginRequest, TokenResponse
 from app.schemas.user import UserResponse
 
 
+# Срок жизни refresh токена (настройки не меняются во время работы процесса)
+_REFRESH_DELTA = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
 class AuthService:
     """
     Сервис аутентификации и авторизации.
@@ -68,34 +71,26 @@ class AuthService:
         Raises:
             EmailAlreadyExistsError: Email уже существует (в т.ч. при race condition)
         """
-        # Предварительная проверка email (оптимизация для обычного случая)
-        if await self.user_repo.email_exists(data.email):
-            raise EmailAlreadyExistsError(data.email)
-
-        user = User(
-            id=uuid.uuid4(),
+        # Хеш считается до вставки и для занятого email тоже:
+        # время ответа не выдаёт, зарегистрирован ли адрес
+        hashed_password = await hash_password_async(data.password)
+
+        # Пользователь и его refresh токен создаются одним запросом;
+        # занятый email (ON CONFLICT DO NOTHING) не создаёт ни того, ни другого
+        user_id = uuid.uuid4()
+        tokens, db_token = self._build_tokens_for_user(user_id, device_info)
+
+        user = await self.user_repo.create_with_refresh_token(
+            db_token,
+            id=user_id,
             email=data.email,
-            hashed_password=hash_password(data.password),
+            hashed_password=hashed_password,
             first_name=data.first_name,
             last_name=data.last_name,
             phone=data.phone,
         )
-
-        # Защита от race condition: ловим IntegrityError при создании
-        try:
-            user = await self.user_repo.create(user)
-        except IntegrityError as e:
-            # Проверяем, связана ли ошибка с email constraint
-            # PostgreSQL error: duplicate key value violates unique constraint "users_email_key"
-            error_info = str(e.orig) if hasattr(e, 'orig') else str(e)
-
-            if 'email' in error_info.lower() or 'unique' in error_info.lower():
-                raise EmailAlreadyExistsError(data.email)
-
-            # Если это другой constraint - пробрасываем дальше
-            raise
-
-        tokens = await self._create_tokens_for_user(user.id, device_info)
+        if user is None:
+            raise EmailAlreadyExistsError(data.email)
 
         return UserResponse.model_validate(user), tokens
 
@@ -119,7 +114,7 @@ class AuthService:
             UserInactiveError: Пользователь неактивен
         """
         user = await self.user_repo.get_by_email(data.email)
-        if not user or not verify_password(data.password, user.hashed_password):
+        if not user or not await verify_password_async(data.password, user.hashed_password):
             raise InvalidCredentialsError()
 
         if not user.is_active:
@@ -159,7 +154,7 @@ class AuthService:
             if not sub or not isinstance(sub, str):
                 raise InvalidTokenError("Token payload missing or invalid 'sub' field")
 
-            user_id = uuid.UUID(sub)
+            user_id = parse_token_subject(sub)
         except (ValueError, TypeError) as e:
             # ValueError - невалидный UUID формат
             # TypeError - проблемы с типами
@@ -168,17 +163,6 @@ class AuthService:
             # jwt.InvalidTokenError, jwt.ExpiredSignatureError, jwt.DecodeError
             raise InvalidTokenError(f"Invalid or expired refresh token: {str(e)}")
 
-        token_hash = hash_refresh_token(refresh_token)
-
-        # Проверка существования токена в БД
-        db_token = await self.token_repo.get_by_token_hash(token_hash)
-        if not db_token or db_token.user_id != user_id:
-            raise RefreshTokenNotFoundError()
-
-        # Проверка срока действия токена
-        if not await self.token_repo.is_token_valid(token_hash):
-            raise RefreshTokenNotFoundError()
-
         # Проверка статуса пользователя
         user = await self.user_repo.get_by_id(user_id)
         if not user:
@@ -187,11 +171,14 @@ class AuthService:
         if not user.is_active:
             raise UserInactiveError(str(user_id))
 
-        # Отзыв старого токена (rotation)
-        await self.token_repo.revoke_token(token_hash)
-
-        # Создание новой пары токенов
-        tokens = await self._create_tokens_for_user(user_id, device_info)
+        # Rotation: отзыв старого токена и сохранение нового одним запросом.
+        # Не найден, чужой, истёк или уже отозван — новый токен не создаётся
+        tokens, db_token = self._build_tokens_for_user(user_id, device_info)
+        rotated = await self.token_repo.rotate(
+            hash_refresh_token(refresh_token), user_id, db_token
+        )
+        if not rotated:
+            raise RefreshTokenNotFoundError()
 
         return tokens
 
@@ -246,16 +233,15 @@ class AuthService:
         if not user:
             raise UserNotFoundError(str(user_id))
 
-        if not verify_password(old_password, user.hashed_password):
+        if not await verify_password_async(old_password, user.hashed_password):
             raise InvalidCredentialsError()
 
-        await self.user_repo.update(
+        # Новый хеш и отзыв всех токенов — одним атомарным запросом
+        await self.user_repo.set_password_and_revoke_tokens(
             user_id,
-            hashed_password=hash_password(new_password)
+            await hash_password_async(new_password)
         )
 
-        await self.token_repo.revoke_all_user_tokens(user_id)
-
     async def delete_user(self, user_id: uuid.UUID) -> None:
         """
         Удаление пользователя (soft delete).
@@ -264,22 +250,17 @@ class AuthService:
         - Отзываются все refresh токены (выход со всех устройств)
         - Пользователь помечается как удаленный (is_deleted=True)
 
+        Обе операции выполняются одним атомарным запросом.
+
         Args:
             user_id: UUID пользователя
 
         Raises:
             UserNotFoundError: Пользователь не найден
         """
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
+        if not await self.user_repo.soft_delete_with_tokens(user_id):
             raise UserNotFoundError(str(user_id))
 
-        # Сначала отзываем все токены
-        await self.token_repo.revoke_all_user_tokens(user_id)
-
-        # Потом soft delete пользователя
-        await self.user_repo.soft_delete(user_id)
-
     async def _create_tokens_for_user(
         self,
         user_id: uuid.UUID,
@@ -295,14 +276,33 @@ class AuthService:
         Returns:
             TokenResponse с access и refresh токенами
         """
+        tokens, db_token = self._build_tokens_for_user(user_id, device_info)
+
+        await self.token_repo.create(db_token)
+
+        return tokens
+
+    def _build_tokens_for_user(
+        self,
+        user_id: uuid.UUID,
+        device_info: str | None = None
+    ) -> tuple[TokenResponse, RefreshToken]:
+        """
+        Выпуск пары токенов без сохранения в БД.
+
+        Args:
+            user_id: UUID пользователя
+            device_info: Информация об устройстве
+
+        Returns:
+            Кортеж (TokenResponse, RefreshToken для сохранения)
+        """
         access_token = create_access_token(data={"sub": str(user_id)})
 
         refresh_token = create_refresh_token(data={"sub": str(user_id)})
         token_hash = hash_refresh_token(refresh_token)
 
-        expires_at = datetime.now(timezone.utc) + timedelta(
-            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-        )
+        expires_at = datetime.now(timezone.utc) + _REFRESH_DELTA
 
         db_token = RefreshToken(
             id=uuid.uuid4(),
@@ -312,10 +312,10 @@ class AuthService:
             device_info=device_info,
         )
 
-        await self.token_repo.create(db_token)
-
-        return TokenResponse(
+        tokens = TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
             token_type="bearer"
         )
+
+        return tokens, db_token
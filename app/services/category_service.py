@@ -1,5 +1,6 @@
 import uuid
 
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import (
@@ -14,6 +15,10 @@ from app.repositories.category import CategoryRepository
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 
 
+# Валидатор списка строится один раз и валидирует весь список за один вызов
+_CATEGORY_LIST_ADAPTER = TypeAdapter(list[CategoryResponse])
+
+
 class CategoryService:
     """
     Сервис для работы с категориями товаров.
@@ -34,9 +39,9 @@ class CategoryService:
         """
         Создание новой категории.
 
-        Уникальность slug и (name + parent_id) гарантируется UNIQUE индексами БД.
-        При дублировании SQLAlchemy выбросит IntegrityError, который обрабатывается
-        глобально в main.py (возвращает 409 Conflict с деталями).
+        Существование родителя и уникальность slug и (name + parent_id) проверяются
+        одним запросом. UNIQUE индексы БД остаются страховкой от гонок:
+        IntegrityError обрабатывается глобально в main.py (409 Conflict).
 
         Args:
             data: Данные для создания категории
@@ -46,19 +51,24 @@ class CategoryService:
 
         Raises:
             CategoryNotFoundError: Родительская категория не найдена
-            IntegrityError: Нарушение уникальности (автоматически → 409 Conflict)
+            CategorySlugAlreadyExistsError: Slug уже занят
+            CategoryNameAlreadyExistsError: Имя уже занято в рамках parent
+            IntegrityError: Нарушение уникальности при гонке (автоматически → 409 Conflict)
         """
-        # Проверка существования parent категории
-        if data.parent_id:
-            parent = await self.category_repo.get_by_id(data.parent_id)
-            if not parent:
-                raise CategoryNotFoundError(category_id=str(data.parent_id))
-
-        # Создание категории
-        # Уникальность slug и name+parent_id проверяется на уровне БД (UNIQUE индексы)
+        slug_taken, name_taken, parent_ok = await self.category_repo.validate_create(
+            data.slug, data.name, data.parent_id
+        )
+        self._raise_for_validation(
+            data.slug, data.name, data.parent_id, slug_taken, name_taken, parent_ok
+        )
+
         category = Category(
             id=uuid.uuid4(),
-            **data.model_dump()
+            name=data.name,
+            slug=data.slug,
+            description=data.description,
+            parent_id=data.parent_id,
+            is_active=data.is_active,
         )
 
         category = await self.category_repo.create(category)
@@ -72,9 +82,9 @@ class CategoryService:
         """
         Обновление существующей категории.
 
-        Уникальность slug и (name + parent_id) гарантируется UNIQUE индексами БД.
-        При дублировании SQLAlchemy выбросит IntegrityError, который обрабатывается
-        глобально в main.py (возвращает 409 Conflict с деталями).
+        Существование нового родителя и уникальность изменяемых slug и
+        (name + parent_id) проверяются одним запросом. UNIQUE индексы БД остаются
+        страховкой от гонок (IntegrityError → 409 Conflict в main.py).
 
         Args:
             category_id: ID категории
@@ -84,42 +94,60 @@ class CategoryService:
             CategoryResponse: Обновленная категория
 
         Raises:
-            CategoryNotFoundError: Категория не найдена
+            CategoryNotFoundError: Категория или новый родитель не найдены
             CategorySelfParentError: Попытка установить саму себя как parent
             CircularCategoryDependencyError: Попытка создать циклическую зависимость
-            IntegrityError: Нарушение уникальности (автоматически → 409 Conflict)
+            CategorySlugAlreadyExistsError: Slug уже занят
+            CategoryNameAlreadyExistsError: Имя уже занято в рамках parent
+            IntegrityError: Нарушение уникальности при гонке (автоматически → 409 Conflict)
         """
         # Получение существующей категории
         category = await self.category_repo.get_by_id(category_id)
         if not category:
             raise CategoryNotFoundError(category_id=str(category_id))
 
-        # Подготовка данных для обновления
-        update_data = data.model_dump(exclude_unset=True)
-
-        # Проверка parent_id (если меняется)
-        if "parent_id" in update_data:
-            new_parent_id = update_data["parent_id"]
-
-            # Нельзя установить саму себя как parent
-            if new_parent_id == category_id:
-                raise CategorySelfParentError(str(category_id))
+        # Подготовка данных для обновления: только поля, значение которых меняется
+        update_data = {
+            field: value
+            for field, value in data.model_dump(exclude_unset=True).items()
+            if getattr(category, field) != value
+        }
+
+        # Нечего менять — без записи в БД (и без сдвига updated_at)
+        if not update_data:
+            return CategoryResponse.model_validate(category)
+
+        parent_changed = "parent_id" in update_data
+        new_parent_id = update_data.get("parent_id", category.parent_id)
+
+        # Нельзя установить саму себя как parent
+        if parent_changed and new_parent_id == category_id:
+            raise CategorySelfParentError(str(category_id))
+
+        # Проверка parent, slug и name+parent_id (только для изменяемых полей)
+        if parent_changed or "slug" in update_data or "name" in update_data:
+            new_slug = update_data.get("slug")
+            new_name = update_data.get("name", category.name)
+
+            slug_taken, name_taken, parent_ok = await self.category_repo.validate_create(
+                new_slug,
+                new_name,
+                new_parent_id,
+                exclude_category_id=category_id,
+                check_parent=parent_changed,
+            )
+            self._raise_for_validation(
+                new_slug, new_name, new_parent_id, slug_taken, name_taken, parent_ok
+            )
+
+        # Проверка на циклическую зависимость
+        if parent_changed and new_parent_id:
+            if await self._creates_circular_dependency(category_id, new_parent_id):
+                raise CircularCategoryDependencyError(
+                    str(category_id),
+                    str(new_parent_id)
+                )
 
-            # Проверка существования parent
-            if new_parent_id:
-                parent = await self.category_repo.get_by_id(new_parent_id)
-                if not parent:
-                    raise CategoryNotFoundError(category_id=str(new_parent_id))
-
-                # Проверка на циклическую зависимость
-                if await self._creates_circular_dependency(category_id, new_parent_id):
-                    raise CircularCategoryDependencyError(
-                        str(category_id),
-                        str(new_parent_id)
-                    )
-
-        # Обновление категории
-        # Уникальность slug и name+parent_id проверяется на уровне БД (UNIQUE индексы)
         updated_category = await self.category_repo.update(category_id, **update_data)
         return CategoryResponse.model_validate(updated_category)
 
@@ -136,12 +164,9 @@ class CategoryService:
         Raises:
             CategoryNotFoundError: Категория не найдена
         """
-        category = await self.category_repo.get_by_id(category_id)
-        if not category:
-            raise CategoryNotFoundError(category_id=str(category_id))
-
         # Soft delete (помечает только эту категорию, подкатегории остаются)
-        await self.category_repo.soft_delete(category_id)
+        if not await self.category_repo.soft_delete(category_id):
+            raise CategoryNotFoundError(category_id=str(category_id))
 
     async def get_category(self, category_id: uuid.UUID) -> CategoryResponse:
         """
@@ -197,7 +222,7 @@ class CategoryService:
             list[CategoryResponse]: Список корневых категорий
         """
         categories = await self.category_repo.get_root_categories(skip=skip, limit=limit)
-        return [CategoryResponse.model_validate(cat) for cat in categories]
+        return _CATEGORY_LIST_ADAPTER.validate_python(categories, from_attributes=True)
 
     async def get_subcategories(
         self,
@@ -219,12 +244,42 @@ class CategoryService:
         Raises:
             CategoryNotFoundError: Родительская категория не найдена
         """
-        parent = await self.category_repo.get_by_id(parent_id)
-        if not parent:
+        # get_by_parent возвращает пусто для несуществующего родителя, поэтому
+        # отдельная проверка нужна только для пустой страницы
+        categories = await self.category_repo.get_by_parent(parent_id, skip=skip, limit=limit)
+        if not categories and not await self.category_repo.id_exists(parent_id):
             raise CategoryNotFoundError(category_id=str(parent_id))
 
-        categories = await self.category_repo.get_by_parent(parent_id, skip=skip, limit=limit)
-        return [CategoryResponse.model_validate(cat) for cat in categories]
+        return _CATEGORY_LIST_ADAPTER.validate_python(categories, from_attributes=True)
+
+    @staticmethod
+    def _raise_for_validation(
+        slug: str | None,
+        name: str | None,
+        parent_id: uuid.UUID | None,
+        slug_taken: bool,
+        name_taken: bool,
+        parent_ok: bool
+    ) -> None:
+        """
+        Преобразование результата validate_create в доменные исключения.
+
+        Raises:
+            CategoryNotFoundError: Родительская категория не найдена
+            CategorySlugAlreadyExistsError: Slug уже занят
+            CategoryNameAlreadyExistsError: Имя уже занято в рамках parent
+        """
+        if not parent_ok:
+            raise CategoryNotFoundError(category_id=str(parent_id))
+
+        if slug_taken:
+            raise CategorySlugAlreadyExistsError(slug)
+
+        if name_taken:
+            raise CategoryNameAlreadyExistsError(
+                name,
+                str(parent_id) if parent_id else None
+            )
 
     async def _creates_circular_dependency(
         self,
@@ -234,8 +289,8 @@ class CategoryService:
         """
         Проверка создания циклической зависимости при изменении parent.
 
-        Проходит вверх по иерархии от new_parent_id и проверяет,
-        не встретится ли category_id на пути.
+        Цикл возникает, если category_id является предком new_parent_id
+        (или совпадает с ним). Вся цепочка проверяется одним запросом.
 
         Args:
             category_id: ID категории, которую хотим переместить
@@ -244,18 +299,4 @@ class CategoryService:
         Returns:
             True если создается циклическая зависимость, False иначе
         """
-        current_id = new_parent_id
-
-        # Проходим вверх по иерархии
-        while current_id:
-            if current_id == category_id:
-                # Нашли циклическую зависимость
-                return True
-
-            current_category = await self.category_repo.get_by_id(current_id)
-            if not current_category:
-                break
-
-            current_id = current_category.parent_id
-
-        return False
+        return await self.category_repo.is_ancestor(category_id, new_parent_id)
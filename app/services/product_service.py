@@ -1,7 +1,10 @@
 import uuid
 
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import get_constraint_name
 from app.core.exceptions import (
     ProductNotFoundError,
     ProductSlugAlreadyExistsError,
@@ -16,6 +19,16 @@ from app.repositories.category import CategoryRepository
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
 
 
+# Валидатор списка строится один раз и валидирует весь список за один вызов
+_PRODUCT_LIST_ADAPTER = TypeAdapter(list[ProductResponse])
+
+# Уникальные индексы и FK products (см. app/models/product.py;
+# имя FK — сгенерированное Postgres по умолчанию)
+_SLUG_INDEX = "ix_product_slug"
+_SKU_INDEX = "ix_product_sku"
+_CATEGORY_FK = "products_category_id_fkey"
+
+
 class ProductService:
     """
     Сервис для работы с продуктами.
@@ -37,9 +50,9 @@ class ProductService:
         """
         Создание нового продукта.
 
-        Уникальность slug и sku гарантируется UNIQUE индексами БД.
-        При дублировании SQLAlchemy выбросит IntegrityError, который обрабатывается
-        глобально в main.py (возвращает 409 Conflict с деталями).
+        Существование категории и уникальность slug и sku проверяются одним
+        запросом. Если при гонке запись всё же упирается в UNIQUE индекс,
+        IntegrityError переводится в то же доменное исключение.
 
         Args:
             data: Данные для создания продукта
@@ -49,21 +62,35 @@ class ProductService:
 
         Raises:
             CategoryNotFoundError: Категория не найдена
-            IntegrityError: Нарушение уникальности (автоматически → 409 Conflict)
+            ProductSlugAlreadyExistsError: Slug уже занят
+            ProductSKUAlreadyExistsError: SKU уже занят
         """
-        # Проверка существования категории
-        category = await self.category_repo.get_by_id(data.category_id)
-        if not category:
-            raise CategoryNotFoundError(category_id=str(data.category_id))
+        category_ok, slug_taken, sku_taken = await self.product_repo.preflight_create(
+            data.category_id, data.slug, data.sku
+        )
+        self._raise_for_preflight(
+            data.category_id, data.slug, data.sku, category_ok, slug_taken, sku_taken
+        )
 
-        # Создание продукта
-        # Уникальность slug и sku проверяется на уровне БД (UNIQUE индексы)
         product = Product(
             id=uuid.uuid4(),
-            **data.model_dump()
+            name=data.name,
+            slug=data.slug,
+            description=data.description,
+            price=data.price,
+            category_id=data.category_id,
+            stock_quantity=data.stock_quantity,
+            sku=data.sku,
+            image_url=data.image_url,
+            is_active=data.is_active,
         )
 
-        product = await self.product_repo.create(product)
+        try:
+            product = await self.product_repo.create(product)
+        except IntegrityError as exc:
+            self._raise_for_integrity_error(exc, data.category_id, data.slug, data.sku)
+            raise
+
         return ProductResponse.model_validate(product)
 
     async def update_product(
@@ -74,9 +101,9 @@ class ProductService:
         """
         Обновление существующего продукта.
 
-        Уникальность slug и sku гарантируется UNIQUE индексами БД.
-        При дублировании SQLAlchemy выбросит IntegrityError, который обрабатывается
-        глобально в main.py (возвращает 409 Conflict с деталями).
+        Существование новой категории и уникальность изменяемых slug и sku
+        проверяются одним запросом. Нарушение UNIQUE индекса при гонке
+        переводится в то же доменное исключение.
 
         Args:
             product_id: ID продукта
@@ -88,25 +115,44 @@ class ProductService:
         Raises:
             ProductNotFoundError: Продукт не найден
             CategoryNotFoundError: Категория не найдена
-            IntegrityError: Нарушение уникальности (автоматически → 409 Conflict)
+            ProductSlugAlreadyExistsError: Slug уже занят
+            ProductSKUAlreadyExistsError: SKU уже занят
         """
         # Получение существующего продукта
         product = await self.product_repo.get_by_id(product_id)
         if not product:
             raise ProductNotFoundError(product_id=str(product_id))
 
-        # Подготовка данных для обновления
-        update_data = data.model_dump(exclude_unset=True)
+        # Подготовка данных для обновления: только поля, значение которых меняется
+        update_data = {
+            field: value
+            for field, value in data.model_dump(exclude_unset=True).items()
+            if getattr(product, field) != value
+        }
+
+        # Нечего менять — без записи в БД (и без сдвига updated_at)
+        if not update_data:
+            return ProductResponse.model_validate(product)
+
+        # Проверка категории, slug и sku (только для изменяемых полей)
+        category_id = update_data.get("category_id")
+        slug = update_data.get("slug")
+        sku = update_data.get("sku")
+
+        if category_id is not None or slug is not None or sku is not None:
+            category_ok, slug_taken, sku_taken = await self.product_repo.preflight_create(
+                category_id, slug, sku, exclude_product_id=product_id
+            )
+            self._raise_for_preflight(
+                category_id, slug, sku, category_ok, slug_taken, sku_taken
+            )
 
-        # Проверка существования категории (если меняется)
-        if "category_id" in update_data:
-            category = await self.category_repo.get_by_id(update_data["category_id"])
-            if not category:
-                raise CategoryNotFoundError(category_id=str(update_data["category_id"]))
+        try:
+            updated_product = await self.product_repo.update(product_id, **update_data)
+        except IntegrityError as exc:
+            self._raise_for_integrity_error(exc, category_id, slug, sku)
+            raise
 
-        # Обновление продукта
-        # Уникальность slug и sku проверяется на уровне БД (UNIQUE индексы)
-        updated_product = await self.product_repo.update(product_id, **update_data)
         return ProductResponse.model_validate(updated_product)
 
     async def delete_product(self, product_id: uuid.UUID) -> None:
@@ -119,12 +165,9 @@ class ProductService:
         Raises:
             ProductNotFoundError: Продукт не найден
         """
-        product = await self.product_repo.get_by_id(product_id)
-        if not product:
+        if not await self.product_repo.soft_delete(product_id):
             raise ProductNotFoundError(product_id=str(product_id))
 
-        await self.product_repo.soft_delete(product_id)
-
     async def get_product(self, product_id: uuid.UUID) -> ProductResponse:
         """
         Получение продукта по ID.
@@ -205,24 +248,22 @@ class ProductService:
             InsufficientStockError: Недостаточно товара на складе
         """
         # Атомарное обновление: UPDATE stock_quantity = stock_quantity + delta
-        # WHERE stock_quantity + delta >= 0
-        updated_product = await self.product_repo.atomic_update_stock(
+        # WHERE stock_quantity + delta >= 0 (вместе с остатком до изменения)
+        updated_product, current_stock = await self.product_repo.atomic_update_stock(
             product_id,
             quantity_delta
         )
 
         # Если update не выполнился - либо продукт не найден, либо недостаточно товара
         if not updated_product:
-            # Проверяем существование продукта для точного сообщения об ошибке
-            product = await self.product_repo.get_by_id(product_id)
-            if not product:
+            if current_stock is None:
                 raise ProductNotFoundError(product_id=str(product_id))
 
             # Продукт существует, значит недостаточно товара
             raise InsufficientStockError(
                 str(product_id),
                 abs(quantity_delta),
-                product.stock_quantity
+                current_stock
             )
 
         return ProductResponse.model_validate(updated_product)
@@ -276,6 +317,61 @@ class ProductService:
 
         return await self.update_stock(product_id, -quantity)
 
+    @staticmethod
+    def _raise_for_preflight(
+        category_id: uuid.UUID | None,
+        slug: str | None,
+        sku: str | None,
+        category_ok: bool,
+        slug_taken: bool,
+        sku_taken: bool
+    ) -> None:
+        """
+        Преобразование результата preflight_create в доменные исключения.
+
+        Raises:
+            CategoryNotFoundError: Категория не найдена
+            ProductSlugAlreadyExistsError: Slug уже занят
+            ProductSKUAlreadyExistsError: SKU уже занят
+        """
+        if not category_ok:
+            raise CategoryNotFoundError(category_id=str(category_id))
+
+        if slug_taken:
+            raise ProductSlugAlreadyExistsError(slug)
+
+        if sku_taken:
+            raise ProductSKUAlreadyExistsError(sku)
+
+    @staticmethod
+    def _raise_for_integrity_error(
+        exc: IntegrityError,
+        category_id: uuid.UUID | None,
+        slug: str | None,
+        sku: str | None
+    ) -> None:
+        """
+        Перевод нарушения уникального индекса или FK в доменное исключение.
+
+        Неизвестные нарушения не обрабатываются: вызывающий код пробрасывает
+        IntegrityError дальше (глобальный обработчик в main.py → 409 Conflict).
+
+        Raises:
+            CategoryNotFoundError: Категория удалена физически после проверки
+            ProductSlugAlreadyExistsError: Slug уже занят
+            ProductSKUAlreadyExistsError: SKU уже занят
+        """
+        constraint = get_constraint_name(exc)
+
+        if constraint == _CATEGORY_FK:
+            raise CategoryNotFoundError(category_id=str(category_id)) from exc
+
+        if constraint == _SLUG_INDEX:
+            raise ProductSlugAlreadyExistsError(slug) from exc
+
+        if constraint == _SKU_INDEX:
+            raise ProductSKUAlreadyExistsError(sku) from exc
+
     async def search_products(
         self,
         search_term: str | None = None,
@@ -314,7 +410,7 @@ class ProductService:
             limit=limit
         )
 
-        return [ProductResponse.model_validate(prod) for prod in products]
+        return _PRODUCT_LIST_ADAPTER.validate_python(products, from_attributes=True)
 
     async def get_low_stock_products(
         self,
@@ -339,4 +435,4 @@ class ProductService:
             limit=limit
         )
 
-        return [ProductResponse.model_validate(prod) for prod in products]
+        return _PRODUCT_LIST_ADAPTER.validate_python(products, from_attributes=True)
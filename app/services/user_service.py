@@ -1,5 +1,6 @@
 import uuid
 
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import UserNotFoundError
@@ -8,6 +9,10 @@ from app.repositories.user import UserRepository
 from app.schemas.user import UserResponse, UserUpdate
 
 
+# Валидатор списка строится один раз и валидирует весь список за один вызов
+_USER_LIST_ADAPTER = TypeAdapter(list[UserResponse])
+
+
 class UserService:
     """
     Сервис для управления пользователями (CRUD операции).
@@ -67,20 +72,19 @@ class UserService:
         Raises:
             UserNotFoundError: Пользователь не найден
         """
-        # Проверка существования
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundError(str(user_id))
-
         # Получение только установленных полей из schema
         update_dict = update_data.model_dump(exclude_unset=True)
 
-        # Обновление только если есть изменения
-        if update_dict:
-            updated_user = await self.user_repo.update(user_id, **update_dict)
-            return UserResponse.model_validate(updated_user)
+        # Нечего менять — просто возвращаем текущие данные
+        if not update_dict:
+            return await self.get_user(user_id)
 
-        return UserResponse.model_validate(user)
+        # UPDATE ... RETURNING: отсутствие строки означает, что пользователь не найден
+        updated_user = await self.user_repo.update(user_id, **update_dict)
+        if not updated_user:
+            raise UserNotFoundError(str(user_id))
+
+        return UserResponse.model_validate(updated_user)
 
     async def list_users(
         self,
@@ -116,4 +120,4 @@ class UserService:
             search=search,
         )
 
-        return [UserResponse.model_validate(user) for user in users]
+        return _USER_LIST_ADAPTER.validate_python(users, from_attributes=True)
@@ -1,8 +1,23 @@
-import re
+import string
 from decimal import Decimal
+from functools import lru_cache
 from urllib.parse import urlparse
 
 
+# Классы символов для проверки сложности пароля (только ASCII, как [A-Z] в regex)
+_UPPER = frozenset(string.ascii_uppercase)
+_LOWER = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+
+# Таблица удаления допустимых символов slug: после translate непустой
+# остаток означает недопустимый символ
+_SLUG_DELETE = str.maketrans("", "", string.ascii_lowercase + string.digits + "-")
+
+# Размер кэша validate_url: повторяющиеся URL (CDN изображений при массовой
+# загрузке товаров) не разбираются urlparse повторно. Ошибки не кэшируются
+_URL_CACHE_SIZE = 4096
+
+
 def validate_slug(slug: str) -> str:
     """
     Валидация slug (URL-friendly строки).
@@ -24,7 +39,13 @@ def validate_slug(slug: str) -> str:
     if not slug:
         raise ValueError("Slug не может быть пустым")
 
-    if not re.match(r"^[a-z0-9]+(?:-[a-z0-9]+)*$", slug):
+    # Эквивалент ^[a-z0-9]+(?:-[a-z0-9]+)*$ без regex
+    if (
+        slug.translate(_SLUG_DELETE)
+        or slug[0] == "-"
+        or slug[-1] == "-"
+        or "--" in slug
+    ):
         raise ValueError(
             "Slug должен содержать только строчные буквы, цифры и дефисы. "
             "Не может начинаться или заканчиваться дефисом"
@@ -33,6 +54,7 @@ def validate_slug(slug: str) -> str:
     return slug
 
 
+@lru_cache(maxsize=_URL_CACHE_SIZE)
 def validate_url(url: str) -> str:
     """
     Валидация URL.
@@ -111,10 +133,13 @@ def validate_password_strength(password: str) -> str:
     Raises:
         ValueError: Если пароль не соответствует требованиям
     """
-    if not re.search(r"[A-Z]", password):
+    # Один проход по строке (на уровне C), дальше — проверки пересечения множеств
+    chars = set(password)
+
+    if chars.isdisjoint(_UPPER):
         raise ValueError("Пароль должен содержать хотя бы одну заглавную букву")
-    if not re.search(r"[a-z]", password):
+    if chars.isdisjoint(_LOWER):
         raise ValueError("Пароль должен содержать хотя бы одну строчную букву")
-    if not re.search(r"[0-9]", password):
+    if chars.isdisjoint(_DIGITS):
         raise ValueError("Пароль должен содержать хотя бы одну цифру")
     return password
@@ -8,20 +8,15 @@ from app.core.database import engine
 
 
 async def clear_all_users():
-    async with engine.connect() as conn:
-        # Сначала удаляем refresh токены (из-за FK constraint)
-        await conn.execute(text("DELETE FROM refresh_tokens"))
-        print("✅ Удалены все refresh токены")
-
-        # Потом удаляем пользователей
-        result = await conn.execute(text("DELETE FROM users"))
-        await conn.commit()
-        print(f"✅ Удалено пользователей: {result.rowcount}")
-
-        # Проверяем
+    # Одна транзакция: подсчёт и TRUNCATE (CASCADE снимает вопрос порядка FK)
+    async with engine.begin() as conn:
         count_result = await conn.execute(text("SELECT COUNT(*) FROM users"))
         count = count_result.scalar()
-        print(f"📊 Осталось пользователей в БД: {count}")
+
+        await conn.execute(text("TRUNCATE TABLE users, refresh_tokens CASCADE"))
+
+    print("✅ Удалены все refresh токены")
+    print(f"✅ Удалено пользователей: {count}")
 
 
 async def show_users():
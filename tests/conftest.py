@@ -1,3 +1,8 @@
+import os
+
+# Минимальная стоимость bcrypt для тестов: хеширование паролей в фикстурах
+# и тестах не проверяет work factor. Задаётся до импорта app (settings)
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
 
 # Импортируем все shared fixtures (DB, client)
 from tests.shared.fixtures.db_fixtures import *  # noqa: F401, F403
@@ -5,3 +10,6 @@ from tests.shared.fixtures.client_fixtures import *  # noqa: F401, F403
 
 # Импортируем domain-specific fixtures (users)
 from tests.users.fixtures.auth_fixtures import *  # noqa: F401, F403
+
+# Импортируем domain-specific fixtures (products)
+from tests.products.fixtures.product_fixtures import *  # noqa: F401, F403
@@ -0,0 +1,82 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.product import Product
+
+
+@pytest.fixture
+async def test_category(db_session: AsyncSession) -> Category:
+    """
+    Создаёт тестовую корневую категорию в БД.
+
+    Args:
+        db_session: Тестовая сессия БД
+
+    Returns:
+        Созданная категория
+    """
+    category = Category(
+        id=uuid.uuid4(),
+        name="Electronics",
+        slug="electronics",
+    )
+
+    db_session.add(category)
+    await db_session.commit()
+
+    return category
+
+
+@pytest.fixture
+async def test_products(db_session: AsyncSession, test_category: Category) -> list[Product]:
+    """
+    Создаёт тестовые товары в категории test_category.
+
+    Args:
+        db_session: Тестовая сессия БД
+        test_category: Категория товаров
+
+    Returns:
+        Список товаров: [iPhone 15, Samsung Galaxy, USB Cable]
+    """
+    products = [
+        Product(
+            id=uuid.uuid4(),
+            name="iPhone 15",
+            slug="iphone-15",
+            description="Smartphone with A16 chip",
+            price=Decimal("999.00"),
+            category_id=test_category.id,
+            stock_quantity=10,
+            sku="APL-IP15",
+        ),
+        Product(
+            id=uuid.uuid4(),
+            name="Samsung Galaxy",
+            slug="samsung-galaxy",
+            description="Android smartphone",
+            price=Decimal("799.00"),
+            category_id=test_category.id,
+            stock_quantity=0,
+            sku="SMS-GLX",
+        ),
+        Product(
+            id=uuid.uuid4(),
+            name="USB Cable",
+            slug="usb-cable",
+            description=None,
+            price=Decimal("9.99"),
+            category_id=test_category.id,
+            stock_quantity=100,
+            sku="USB-C",
+        ),
+    ]
+
+    db_session.add_all(products)
+    await db_session.commit()
+
+    return products
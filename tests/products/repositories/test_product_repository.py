@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.product import Product
+from app.repositories.product import ProductRepository
+
+
+@pytest.mark.integration
+class TestProductRepositorySearch:
+    """Тесты поиска продуктов ProductRepository.search"""
+
+    @pytest.mark.parametrize(
+        "search_term",
+        [
+            pytest.param("ip", id="short_prefix"),
+            pytest.param("phon", id="partial_word"),
+            pytest.param("IPHONE", id="case_insensitive"),
+            pytest.param("A16", id="description"),
+        ],
+    )
+    async def test_search_matches_substring(
+        self,
+        db_session: AsyncSession,
+        test_products: list[Product],
+        search_term: str
+    ):
+        """search находит товар по подстроке названия или описания"""
+        iphone, _, cable = test_products
+        repo = ProductRepository(db_session)
+
+        result = await repo.search(search_term)
+
+        ids = {p.id for p in result}
+        assert iphone.id in ids
+        assert cable.id not in ids
+
+    async def test_search_substring_inside_word(
+        self,
+        db_session: AsyncSession,
+        test_products: list[Product]
+    ):
+        """search находит подстроку в середине слова в обоих полях"""
+        iphone, galaxy, cable = test_products
+        repo = ProductRepository(db_session)
+
+        result = await repo.search("martphon")
+
+        ids = {p.id for p in result}
+        assert ids >= {iphone.id, galaxy.id}
+        assert cable.id not in ids
+
+    async def test_search_no_match_returns_empty(
+        self,
+        db_session: AsyncSession,
+        test_products: list[Product]
+    ):
+        """search без совпадений возвращает пустой список"""
+        repo = ProductRepository(db_session)
+
+        result = await repo.search("laptop")
+
+        assert result == []
+
+    async def test_search_excludes_soft_deleted(
+        self,
+        db_session: AsyncSession,
+        test_products: list[Product]
+    ):
+        """search не возвращает soft-deleted товары"""
+        iphone = test_products[0]
+        repo = ProductRepository(db_session)
+        await repo.soft_delete(iphone.id)
+
+        result = await repo.search("phon")
+
+        assert iphone.id not in {p.id for p in result}
+
+    async def test_search_combines_with_filters(
+        self,
+        db_session: AsyncSession,
+        test_category: Category,
+        test_products: list[Product]
+    ):
+        """Подстрока комбинируется с фильтрами категории, цены и наличия"""
+        iphone, galaxy, _ = test_products
+        repo = ProductRepository(db_session)
+
+        in_stock = await repo.search("phon", category_id=test_category.id, in_stock_only=True)
+        cheap = await repo.search("phon", max_price=800.0)
+
+        assert {p.id for p in in_stock} == {iphone.id}
+        assert {p.id for p in cheap} == {galaxy.id}
@@ -0,0 +1,63 @@
+"""
+Интеграционные тесты для ProductService.
+
+Покрывает:
+- create_product / update_product: обрезка пробелов в описании и URL изображения
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.product import Product
+from app.repositories.product import ProductRepository
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.product_service import ProductService
+
+
+@pytest.mark.integration
+class TestProductServiceStripping:
+    """Тесты обрезки пробелов в description и image_url"""
+
+    async def test_create_product_strips_description_and_image_url(
+        self,
+        db_session: AsyncSession,
+        test_category: Category
+    ):
+        """Описание и URL с пробелами принимаются и сохраняются обрезанными"""
+        service = ProductService(db_session)
+        data = ProductCreate(
+            name="Pixel 8",
+            slug="pixel-8",
+            description="  Smartphone with Tensor G3  ",
+            price=Decimal("699.00"),
+            category_id=test_category.id,
+            image_url="  https://example.com/pixel-8.png  ",
+        )
+
+        response = await service.create_product(data)
+
+        stored = await ProductRepository(db_session).get_by_id(response.id)
+        assert stored.description == "Smartphone with Tensor G3"
+        assert stored.image_url == "https://example.com/pixel-8.png"
+
+    async def test_update_product_strips_description_and_image_url(
+        self,
+        db_session: AsyncSession,
+        test_products: list[Product]
+    ):
+        """Обновление с пробелами в описании и URL сохраняет обрезанные значения"""
+        iphone = test_products[0]
+        service = ProductService(db_session)
+        data = ProductUpdate(
+            description="  Flagship smartphone  ",
+            image_url="  https://example.com/iphone-15.png  ",
+        )
+
+        response = await service.update_product(iphone.id, data)
+
+        stored = await ProductRepository(db_session).get_by_id(response.id)
+        assert stored.description == "Flagship smartphone"
+        assert stored.image_url == "https://example.com/iphone-15.png"
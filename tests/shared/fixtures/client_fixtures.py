@@ -8,12 +8,34 @@ from app.core.database import get_db
 from app.main import app
 
 
+@pytest.fixture(scope="session")
+async def shared_client() -> AsyncGenerator[AsyncClient, None]:
+    """
+    HTTP клиент приложения, общий для всей сессии тестирования.
+
+    ASGITransport и AsyncClient строятся один раз; тестовая БД
+    подключается per-test в фикстуре client.
+
+    Yields:
+        AsyncClient для тестирования API endpoints
+    """
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as test_client:
+        yield test_client
+
+
 @pytest.fixture
-async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+async def client(
+    shared_client: AsyncClient,
+    db_session: AsyncSession
+) -> AsyncGenerator[AsyncClient, None]:
     """
     Создаёт тестовый HTTP клиент с переопределённой БД.
 
     Args:
+        shared_client: Общий HTTP клиент сессии
         db_session: Тестовая сессия БД
 
     Yields:
@@ -27,10 +49,8 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
 
     app.dependency_overrides[get_db] = override_get_db
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test"
-    ) as test_client:
-        yield test_client
+    yield shared_client
 
-    app.dependency_overrides.clear()
+    # Клиент общий — состояние одного теста не должно попасть в следующий
+    shared_client.cookies.clear()
+    app.dependency_overrides.pop(get_db, None)
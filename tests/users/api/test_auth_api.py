@@ -85,87 +85,95 @@ class TestRegister:
         data = response.json()
         assert "detail" in data
 
-    async def test_register_invalid_email(self, client: AsyncClient):
-        """Регистрация с невалидным email возвращает 422"""
-        # Arrange
-        payload = {
-            "email": "not-an-email",
-            "password": "SecurePass123!",
-            "first_name": "Test",
-            "last_name": "User",
-        }
-
-        # Act
-        response = await client.post("/api/v1/auth/register", json=payload)
-
-        # Assert
-        assert response.status_code == 422
-
-    async def test_register_weak_password(self, client: AsyncClient):
-        """Регистрация со слабым паролем возвращает 422"""
-        # Arrange
-        payload = {
-            "email": "test@example.com",
-            "password": "123",  # слишком короткий
-            "first_name": "Test",
-            "last_name": "User",
-        }
-
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param(
+                {
+                    "email": "not-an-email",
+                    "password": "SecurePass123!",
+                    "first_name": "Test",
+                    "last_name": "User",
+                },
+                id="invalid_email",
+            ),
+            pytest.param(
+                {
+                    "email": "test@example.com",
+                    "password": "123",  # слишком короткий
+                    "first_name": "Test",
+                    "last_name": "User",
+                },
+                id="weak_password",
+            ),
+            pytest.param(
+                {
+                    "email": "test@example.com",
+                    # отсутствуют password, first_name, last_name
+                },
+                id="missing_required_fields",
+            ),
+            pytest.param(
+                {
+                    "email": "test@example.com",
+                    "password": "SecurePass123!",
+                    "first_name": "Test",
+                    "last_name": "User",
+                    "extra_field": "should not be here",  # лишнее поле (extra='forbid')
+                },
+                id="extra_fields_forbidden",
+            ),
+        ],
+    )
+    async def test_register_invalid_payload(self, client: AsyncClient, payload: dict):
+        """Регистрация с невалидными данными возвращает 422"""
         # Act
         response = await client.post("/api/v1/auth/register", json=payload)
 
         # Assert
         assert response.status_code == 422
 
-    async def test_register_missing_required_fields(self, client: AsyncClient):
-        """Регистрация без обязательных полей возвращает 422"""
-        # Arrange
-        payload = {
-            "email": "test@example.com",
-            # отсутствуют password, first_name, last_name
-        }
-
-        # Act
-        response = await client.post("/api/v1/auth/register", json=payload)
-
-        # Assert
-        assert response.status_code == 422
-
-    async def test_register_extra_fields_forbidden(self, client: AsyncClient):
-        """Регистрация с лишними полями возвращает 422 (extra='forbid')"""
+    async def test_register_without_optional_phone(self, client: AsyncClient):
+        """Регистрация без опционального поля phone работает"""
         # Arrange
         payload = {
-            "email": "test@example.com",
+            "email": "nophone@example.com",
             "password": "SecurePass123!",
-            "first_name": "Test",
-            "last_name": "User",
-            "extra_field": "should not be here",  # лишнее поле
+            "first_name": "No",
+            "last_name": "Phone",
+            # phone не указан
         }
 
         # Act
         response = await client.post("/api/v1/auth/register", json=payload)
 
         # Assert
-        assert response.status_code == 422
+        assert response.status_code == 201
+        data = response.json()
+        assert data["user"]["phone"] is None
 
-    async def test_register_without_optional_phone(self, client: AsyncClient):
-        """Регистрация без опционального поля phone работает"""
+    async def test_register_strips_password_and_phone(self, client: AsyncClient):
+        """Пробелы вокруг пароля и телефона обрезаются; логин без них проходит"""
         # Arrange
         payload = {
-            "email": "nophone@example.com",
-            "password": "SecurePass123!",
-            "first_name": "No",
-            "last_name": "Phone",
-            # phone не указан
+            "email": "spaces@example.com",
+            "password": "  SecurePass123!  ",
+            "first_name": "Space",
+            "last_name": "User",
+            "phone": " +1234567890 ",
         }
 
         # Act
         response = await client.post("/api/v1/auth/register", json=payload)
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": payload["email"], "password": "SecurePass123!"},
+        )
 
         # Assert
         assert response.status_code == 201
-        data = response.json()
-        assert data["user"]["phone"] is None
+        assert response.json()["user"]["phone"] == "+1234567890"
+        assert login_response.status_code == 200
 
 
 class TestLogin:
@@ -206,6 +214,25 @@ class TestLogin:
         assert "refresh_token" in tokens
         assert tokens["token_type"] == "bearer"
 
+    async def test_login_strips_password_whitespace(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_password: str,
+    ):
+        """Пароль с пробелами вокруг принимается, как при регистрации"""
+        # Arrange
+        payload = {
+            "email": test_user.email,
+            "password": f"  {test_password} ",
+        }
+
+        # Act
+        response = await client.post("/api/v1/auth/login", json=payload)
+
+        # Assert
+        assert response.status_code == 200
+
     async def test_login_wrong_password(
         self,
         client: AsyncClient,
@@ -307,16 +334,11 @@ class TestRefreshTokens:
     async def test_refresh_tokens_success(
         self,
         client: AsyncClient,
-        test_user: User,
-        test_password: str,
+        logged_in_tokens: dict[str, str],
     ):
         """Успешное обновление токенов с валидным refresh token"""
-        # Arrange - сначала логинимся для получения refresh token
-        login_response = await client.post(
-            "/api/v1/auth/login",
-            json={"email": test_user.email, "password": test_password},
-        )
-        old_refresh_token = login_response.json()["tokens"]["refresh_token"]
+        # Arrange - refresh token из логина
+        old_refresh_token = logged_in_tokens["refresh_token"]
 
         # Act - обновляем токены
         response = await client.post(
@@ -349,16 +371,11 @@ class TestRefreshTokens:
     async def test_refresh_tokens_reuse_old_token(
         self,
         client: AsyncClient,
-        test_user: User,
-        test_password: str,
+        logged_in_tokens: dict[str, str],
     ):
         """Попытка повторного использования старого refresh token возвращает 401"""
-        # Arrange - логинимся и обновляем токены
-        login_response = await client.post(
-            "/api/v1/auth/login",
-            json={"email": test_user.email, "password": test_password},
-        )
-        old_refresh_token = login_response.json()["tokens"]["refresh_token"]
+        # Arrange - берём refresh token из логина и обновляем токены
+        old_refresh_token = logged_in_tokens["refresh_token"]
 
         # Обновляем токены первый раз
         await client.post(
@@ -383,16 +400,12 @@ class TestLogout:
         self,
         client: AsyncClient,
         test_user: User,
-        test_password: str,
+        logged_in_tokens: dict[str, str],
         auth_headers,
     ):
         """Успешный выход с валидным refresh token"""
-        # Arrange - логинимся для получения refresh token
-        login_response = await client.post(
-            "/api/v1/auth/login",
-            json={"email": test_user.email, "password": test_password},
-        )
-        refresh_token = login_response.json()["tokens"]["refresh_token"]
+        # Arrange - refresh token из логина
+        refresh_token = logged_in_tokens["refresh_token"]
         headers = auth_headers(test_user)
 
         # Act
@@ -411,16 +424,12 @@ class TestLogout:
         self,
         client: AsyncClient,
         test_user: User,
-        test_password: str,
+        logged_in_tokens: dict[str, str],
         auth_headers,
     ):
         """Выход с уже отозванным токеном возвращает 401"""
         # Arrange
-        login_response = await client.post(
-            "/api/v1/auth/login",
-            json={"email": test_user.email, "password": test_password},
-        )
-        refresh_token = login_response.json()["tokens"]["refresh_token"]
+        refresh_token = logged_in_tokens["refresh_token"]
         headers = auth_headers(test_user)
 
         # Выходим первый раз
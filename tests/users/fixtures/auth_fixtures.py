@@ -2,18 +2,38 @@ import uuid
 from typing import Callable
 
 import pytest
+from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import hash_password, create_access_token
 from app.models.user import User, UserRole
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_password() -> str:
-    """Возвращает тестовый пароль для обычных пользователей"""
+    """
+    Возвращает тестовый пароль для обычных пользователей.
+
+    Session scope: от него зависит session_hashed_password, поэтому хеш
+    и пароль всегда выводятся из одного значения.
+    """
     return "TestPassword123"
 
 
+@pytest.fixture(scope="session")
+def session_hashed_password(test_password: str) -> str:
+    """
+    Bcrypt-хеш test_password, вычисленный один раз за сессию.
+
+    Args:
+        test_password: Тестовый пароль
+
+    Returns:
+        Хеш пароля test_password
+    """
+    return hash_password(test_password)
+
+
 @pytest.fixture
 def admin_password() -> str:
     """Возвращает тестовый пароль для администратора"""
@@ -21,13 +41,13 @@ def admin_password() -> str:
 
 
 @pytest.fixture
-async def test_user(db_session: AsyncSession, test_password: str) -> User:
+async def test_user(db_session: AsyncSession, session_hashed_password: str) -> User:
     """
     Создаёт тестового пользователя (CUSTOMER) в БД.
 
     Args:
         db_session: Тестовая сессия БД
-        test_password: Пароль для пользователя
+        session_hashed_password: Хеш пароля test_password
 
     Returns:
         Созданный пользователь
@@ -35,7 +55,7 @@ async def test_user(db_session: AsyncSession, test_password: str) -> User:
     user = User(
         id=uuid.uuid4(),
         email="test@example.com",
-        hashed_password=hash_password(test_password),
+        hashed_password=session_hashed_password,
         first_name="Test",
         last_name="User",
         phone="+1234567890",
@@ -79,13 +99,13 @@ async def test_admin(db_session: AsyncSession, admin_password: str) -> User:
 
 
 @pytest.fixture
-async def test_inactive_user(db_session: AsyncSession, test_password: str) -> User:
+async def test_inactive_user(db_session: AsyncSession, session_hashed_password: str) -> User:
     """
     Создаёт неактивного пользователя (is_active=False) в БД.
 
     Args:
         db_session: Тестовая сессия БД
-        test_password: Пароль для пользователя
+        session_hashed_password: Хеш пароля test_password
 
     Returns:
         Созданный неактивный пользователь
@@ -93,7 +113,7 @@ async def test_inactive_user(db_session: AsyncSession, test_password: str) -> Us
     user = User(
         id=uuid.uuid4(),
         email="inactive@example.com",
-        hashed_password=hash_password(test_password),
+        hashed_password=session_hashed_password,
         first_name="Inactive",
         last_name="User",
         phone="+1111111111",
@@ -109,13 +129,13 @@ async def test_inactive_user(db_session: AsyncSession, test_password: str) -> Us
 
 
 @pytest.fixture
-async def test_unverified_user(db_session: AsyncSession, test_password: str) -> User:
+async def test_unverified_user(db_session: AsyncSession, session_hashed_password: str) -> User:
     """
     Создаёт неверифицированного пользователя (is_verified=False) в БД.
 
     Args:
         db_session: Тестовая сессия БД
-        test_password: Пароль для пользователя
+        session_hashed_password: Хеш пароля test_password
 
     Returns:
         Созданный неверифицированный пользователь
@@ -123,7 +143,7 @@ async def test_unverified_user(db_session: AsyncSession, test_password: str) ->
     user = User(
         id=uuid.uuid4(),
         email="unverified@example.com",
-        hashed_password=hash_password(test_password),
+        hashed_password=session_hashed_password,
         first_name="Unverified",
         last_name="User",
         phone="+2222222222",
@@ -158,35 +178,59 @@ def auth_headers() -> Callable[[User], dict[str, str]]:
 
 
 @pytest.fixture
-async def test_users(db_session: AsyncSession, test_password: str) -> list[User]:
+async def logged_in_tokens(
+    client: AsyncClient,
+    test_user: User,
+    test_password: str,
+) -> dict[str, str]:
+    """
+    Логинит test_user через API и возвращает выданные токены.
+
+    Args:
+        client: Тестовый HTTP клиент
+        test_user: Пользователь для логина
+        test_password: Пароль пользователя
+
+    Returns:
+        Словарь tokens из ответа /login (access_token, refresh_token, token_type)
+    """
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": test_user.email, "password": test_password},
+    )
+    assert response.status_code == 200
+
+    return response.json()["tokens"]
+
+
+@pytest.fixture
+async def test_users(db_session: AsyncSession, session_hashed_password: str) -> list[User]:
     """
     Создаёт несколько тестовых пользователей для тестирования пагинации.
 
     Args:
         db_session: Тестовая сессия БД
-        test_password: Пароль для пользователей
+        session_hashed_password: Хеш пароля test_password
 
     Returns:
         Список из 5 созданных пользователей
     """
-    users = []
-
-    for i in range(5):
-        user = User(
+    users = [
+        User(
             id=uuid.uuid4(),
             email=f"user{i}@example.com",
-            hashed_password=hash_password(test_password),
+            hashed_password=session_hashed_password,
             first_name=f"User{i}",
             last_name=f"Test{i}",
             phone=f"+100000000{i}",
             role=UserRole.CUSTOMER,
         )
-        db_session.add(user)
-        users.append(user)
+        for i in range(5)
+    ]
 
+    # Один batched INSERT ... RETURNING; серверные значения (created_at и т.д.)
+    # подставляются из RETURNING (eager_defaults), refresh не нужен
+    db_session.add_all(users)
     await db_session.commit()
 
-    for user in users:
-        await db_session.refresh(user)
-
     return users
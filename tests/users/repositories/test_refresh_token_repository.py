@@ -25,7 +25,7 @@ class TestRefreshTokenRepositoryBase:
         # Создаём токен
         token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"test_token_1").hexdigest(),
+            token_hash=hashlib.sha256(b"test_token_1").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             device_info="Test Device",
@@ -58,7 +58,7 @@ class TestRefreshTokenRepositoryBase:
 
         token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"test_token_2").hexdigest(),
+            token_hash=hashlib.sha256(b"test_token_2").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -80,7 +80,7 @@ class TestRefreshTokenRepositoryBase:
 
         token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"test_token_3").hexdigest(),
+            token_hash=hashlib.sha256(b"test_token_3").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -105,7 +105,7 @@ class TestRefreshTokenRepositoryBase:
         for i in range(3):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"test_token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"test_token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -129,7 +129,7 @@ class TestRefreshTokenRepositoryBase:
         for i in range(5):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"test_token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"test_token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -155,7 +155,7 @@ class TestRefreshTokenRepositoryBase:
         for i in range(3):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"test_token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"test_token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -182,7 +182,7 @@ class TestRefreshTokenRepositoryBase:
         for i in range(3):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"test_token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"test_token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -205,7 +205,7 @@ class TestRefreshTokenRepositoryBase:
         for i in range(3):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"test_token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"test_token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -231,7 +231,7 @@ class TestRefreshTokenRepositoryBase:
         for i in range(3):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"test_token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"test_token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -255,7 +255,7 @@ class TestRefreshTokenRepositoryBase:
 
         new_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"new_token").hexdigest(),
+            token_hash=hashlib.sha256(b"new_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             device_info="iPhone 13",
@@ -283,7 +283,7 @@ class TestRefreshTokenRepositoryBase:
 
         token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"test_token").hexdigest(),
+            token_hash=hashlib.sha256(b"test_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             device_info="Old Device",
@@ -322,7 +322,7 @@ class TestRefreshTokenRepositoryBase:
 
         token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"test_token").hexdigest(),
+            token_hash=hashlib.sha256(b"test_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -344,7 +344,7 @@ class TestRefreshTokenRepositoryBase:
 
         token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"test_token").hexdigest(),
+            token_hash=hashlib.sha256(b"test_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -382,7 +382,7 @@ class TestRefreshTokenRepositoryBase:
 
         token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"test_token").hexdigest(),
+            token_hash=hashlib.sha256(b"test_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -404,7 +404,7 @@ class TestRefreshTokenRepositoryBase:
 
         token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"test_token").hexdigest(),
+            token_hash=hashlib.sha256(b"test_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -445,7 +445,7 @@ class TestRefreshTokenRepositorySpecific:
         """Получение существующего токена по хешу возвращает токен"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"test_token").hexdigest()
+        token_hash = hashlib.sha256(b"test_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -468,7 +468,7 @@ class TestRefreshTokenRepositorySpecific:
         """Получение несуществующего токена по хешу возвращает None"""
         repo = RefreshTokenRepository(db_session)
 
-        result = await repo.get_by_token_hash("nonexistent_hash")
+        result = await repo.get_by_token_hash(b"nonexistent_hash")
 
         assert result is None
 
@@ -480,7 +480,7 @@ class TestRefreshTokenRepositorySpecific:
         """Отозванный токен исключается по умолчанию при поиске по хешу"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"test_token").hexdigest()
+        token_hash = hashlib.sha256(b"test_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -503,7 +503,7 @@ class TestRefreshTokenRepositorySpecific:
         """Отозванный токен включается при include_revoked=True"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"test_token").hexdigest()
+        token_hash = hashlib.sha256(b"test_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -527,7 +527,7 @@ class TestRefreshTokenRepositorySpecific:
         """Soft-deleted токен исключается по умолчанию при поиске по хешу"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"test_token").hexdigest()
+        token_hash = hashlib.sha256(b"test_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -550,7 +550,7 @@ class TestRefreshTokenRepositorySpecific:
         """Soft-deleted токен включается при include_deleted=True"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"test_token").hexdigest()
+        token_hash = hashlib.sha256(b"test_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -579,7 +579,7 @@ class TestRefreshTokenRepositorySpecific:
         for i in range(3):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"user_token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"user_token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -588,7 +588,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём токен для test_admin
         admin_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"admin_token").hexdigest(),
+            token_hash=hashlib.sha256(b"admin_token").digest(),
             user_id=test_admin.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -612,7 +612,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём активный токен
         active_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"active_token").hexdigest(),
+            token_hash=hashlib.sha256(b"active_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -621,7 +621,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём отозванный токен
         revoked_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"revoked_token").hexdigest(),
+            token_hash=hashlib.sha256(b"revoked_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -646,7 +646,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём активный токен
         active_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"active_token").hexdigest(),
+            token_hash=hashlib.sha256(b"active_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -655,7 +655,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём отозванный токен
         revoked_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"revoked_token").hexdigest(),
+            token_hash=hashlib.sha256(b"revoked_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -681,7 +681,7 @@ class TestRefreshTokenRepositorySpecific:
         for i in range(2):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -705,7 +705,7 @@ class TestRefreshTokenRepositorySpecific:
         """is_token_valid возвращает True для валидного токена"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"valid_token").hexdigest()
+        token_hash = hashlib.sha256(b"valid_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -726,7 +726,7 @@ class TestRefreshTokenRepositorySpecific:
         """is_token_valid возвращает False для несуществующего токена"""
         repo = RefreshTokenRepository(db_session)
 
-        is_valid = await repo.is_token_valid("nonexistent_hash")
+        is_valid = await repo.is_token_valid(b"nonexistent_hash")
 
         assert is_valid is False
 
@@ -738,7 +738,7 @@ class TestRefreshTokenRepositorySpecific:
         """is_token_valid возвращает False для истекшего токена"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"expired_token").hexdigest()
+        token_hash = hashlib.sha256(b"expired_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -760,7 +760,7 @@ class TestRefreshTokenRepositorySpecific:
         """is_token_valid возвращает False для отозванного токена"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"revoked_token").hexdigest()
+        token_hash = hashlib.sha256(b"revoked_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -783,7 +783,7 @@ class TestRefreshTokenRepositorySpecific:
         """is_token_valid возвращает False для soft-deleted токена"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"deleted_token").hexdigest()
+        token_hash = hashlib.sha256(b"deleted_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -806,7 +806,7 @@ class TestRefreshTokenRepositorySpecific:
         """revoke_token успешно отзывает токен"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"test_token").hexdigest()
+        token_hash = hashlib.sha256(b"test_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -832,7 +832,7 @@ class TestRefreshTokenRepositorySpecific:
         """revoke_token возвращает False для несуществующего токена"""
         repo = RefreshTokenRepository(db_session)
 
-        success = await repo.revoke_token("nonexistent_hash")
+        success = await repo.revoke_token(b"nonexistent_hash")
 
         assert success is False
 
@@ -844,7 +844,7 @@ class TestRefreshTokenRepositorySpecific:
         """revoke_token возвращает False для уже отозванного токена"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"test_token").hexdigest()
+        token_hash = hashlib.sha256(b"test_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -867,7 +867,7 @@ class TestRefreshTokenRepositorySpecific:
         """revoke_token возвращает False для soft-deleted токена"""
         repo = RefreshTokenRepository(db_session)
 
-        token_hash = hashlib.sha256(b"test_token").hexdigest()
+        token_hash = hashlib.sha256(b"test_token").digest()
         token = RefreshToken(
             id=uuid.uuid4(),
             token_hash=token_hash,
@@ -882,6 +882,104 @@ class TestRefreshTokenRepositorySpecific:
 
         assert success is False
 
+    async def test_rotate_revokes_old_and_creates_new_token(
+        self,
+        db_session: AsyncSession,
+        test_user: User
+    ):
+        """rotate отзывает старый токен и сохраняет новый"""
+        repo = RefreshTokenRepository(db_session)
+
+        old_hash = hashlib.sha256(b"old_token").digest()
+        await repo.create(RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=old_hash,
+            user_id=test_user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        ))
+        await db_session.commit()
+
+        new_token = RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=hashlib.sha256(b"new_token").digest(),
+            user_id=test_user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+            device_info="New Device",
+        )
+
+        rotated = await repo.rotate(old_hash, test_user.id, new_token)
+
+        assert rotated is True
+        assert await repo.is_token_valid(old_hash) is False
+        assert await repo.is_token_valid(new_token.token_hash) is True
+
+    @pytest.mark.parametrize("is_revoked, expires_in", [
+        (True, timedelta(days=7)),
+        (False, timedelta(days=-1)),
+    ])
+    async def test_rotate_returns_false_for_invalid_token(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        is_revoked: bool,
+        expires_in: timedelta
+    ):
+        """rotate не создаёт новый токен, если старый отозван или истёк"""
+        repo = RefreshTokenRepository(db_session)
+
+        old_hash = hashlib.sha256(b"old_token").digest()
+        token = RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=old_hash,
+            user_id=test_user.id,
+            expires_at=datetime.now(timezone.utc) + expires_in,
+        )
+        token.is_revoked = is_revoked
+        await repo.create(token)
+        await db_session.commit()
+
+        new_token = RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=hashlib.sha256(b"new_token").digest(),
+            user_id=test_user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        )
+
+        rotated = await repo.rotate(old_hash, test_user.id, new_token)
+
+        assert rotated is False
+        assert await repo.get_by_token_hash(new_token.token_hash) is None
+
+    async def test_rotate_returns_false_for_other_user(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_admin: User
+    ):
+        """rotate не трогает токен, принадлежащий другому пользователю"""
+        repo = RefreshTokenRepository(db_session)
+
+        old_hash = hashlib.sha256(b"old_token").digest()
+        await repo.create(RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=old_hash,
+            user_id=test_user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        ))
+        await db_session.commit()
+
+        new_token = RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=hashlib.sha256(b"new_token").digest(),
+            user_id=test_admin.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        )
+
+        rotated = await repo.rotate(old_hash, test_admin.id, new_token)
+
+        assert rotated is False
+        assert await repo.is_token_valid(old_hash) is True
+
     async def test_revoke_all_user_tokens_success(
         self,
         db_session: AsyncSession,
@@ -895,7 +993,7 @@ class TestRefreshTokenRepositorySpecific:
         for i in range(3):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -922,7 +1020,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём активный токен
         active_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"active_token").hexdigest(),
+            token_hash=hashlib.sha256(b"active_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -931,7 +1029,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём уже отозванный токен
         revoked_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"revoked_token").hexdigest(),
+            token_hash=hashlib.sha256(b"revoked_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -954,7 +1052,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём активный токен
         active_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"active_token").hexdigest(),
+            token_hash=hashlib.sha256(b"active_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -963,7 +1061,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём удалённый токен
         deleted_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"deleted_token").hexdigest(),
+            token_hash=hashlib.sha256(b"deleted_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -998,7 +1096,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём истекший токен
         expired_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"expired_token").hexdigest(),
+            token_hash=hashlib.sha256(b"expired_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) - timedelta(days=1),
         )
@@ -1007,7 +1105,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём валидный токен
         valid_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"valid_token").hexdigest(),
+            token_hash=hashlib.sha256(b"valid_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -1034,7 +1132,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём только валидный токен
         valid_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"valid_token").hexdigest(),
+            token_hash=hashlib.sha256(b"valid_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -1055,7 +1153,7 @@ class TestRefreshTokenRepositorySpecific:
 
         expired_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"expired_token").hexdigest(),
+            token_hash=hashlib.sha256(b"expired_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) - timedelta(days=1),
         )
@@ -1081,7 +1179,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём истекший токен для test_user
         user_expired_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"user_expired").hexdigest(),
+            token_hash=hashlib.sha256(b"user_expired").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) - timedelta(days=1),
         )
@@ -1090,7 +1188,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём валидный токен для test_user
         user_valid_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"user_valid").hexdigest(),
+            token_hash=hashlib.sha256(b"user_valid").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -1099,7 +1197,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём истекший токен для test_admin
         admin_expired_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"admin_expired").hexdigest(),
+            token_hash=hashlib.sha256(b"admin_expired").digest(),
             user_id=test_admin.id,
             expires_at=datetime.now(timezone.utc) - timedelta(days=1),
         )
@@ -1128,7 +1226,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём только валидный токен
         valid_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"valid_token").hexdigest(),
+            token_hash=hashlib.sha256(b"valid_token").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -1150,7 +1248,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём активный токен
         active_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"active").hexdigest(),
+            token_hash=hashlib.sha256(b"active").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -1159,7 +1257,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём истекший токен
         expired_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"expired").hexdigest(),
+            token_hash=hashlib.sha256(b"expired").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) - timedelta(days=1),
         )
@@ -1168,7 +1266,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём отозванный токен
         revoked_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"revoked").hexdigest(),
+            token_hash=hashlib.sha256(b"revoked").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -1178,7 +1276,7 @@ class TestRefreshTokenRepositorySpecific:
         # Создаём удалённый токен
         deleted_token = RefreshToken(
             id=uuid.uuid4(),
-            token_hash=hashlib.sha256(b"deleted").hexdigest(),
+            token_hash=hashlib.sha256(b"deleted").digest(),
             user_id=test_user.id,
             expires_at=datetime.now(timezone.utc) + timedelta(days=7),
         )
@@ -1214,7 +1312,7 @@ class TestRefreshTokenRepositorySpecific:
         for i in range(3):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"active_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"active_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -1238,7 +1336,7 @@ class TestRefreshTokenRepositorySpecific:
         for i in range(2):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"user_token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"user_token_{i}".encode()).digest(),
                 user_id=test_user.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -1248,7 +1346,7 @@ class TestRefreshTokenRepositorySpecific:
         for i in range(3):
             token = RefreshToken(
                 id=uuid.uuid4(),
-                token_hash=hashlib.sha256(f"admin_token_{i}".encode()).hexdigest(),
+                token_hash=hashlib.sha256(f"admin_token_{i}".encode()).digest(),
                 user_id=test_admin.id,
                 expires_at=datetime.now(timezone.utc) + timedelta(days=7),
             )
@@ -1,10 +1,12 @@
 import uuid
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password
+from app.models.refresh_token import RefreshToken
 from app.models.user import User, UserRole
+from app.repositories.refresh_token import RefreshTokenRepository
 from app.repositories.user import UserRepository
 
 
@@ -61,12 +63,14 @@ class TestUserRepositoryBase:
     async def test_get_all_returns_all_users(
         self,
         db_session: AsyncSession,
-        test_users: list[User]
+        test_users: list[User],
+        assert_query_count
     ):
-        """get_all возвращает всех пользователей"""
+        """get_all возвращает всех пользователей одним запросом"""
         repo = UserRepository(db_session)
 
-        result = await repo.get_all()
+        with assert_query_count(1):
+            result = await repo.get_all()
 
         assert len(result) == 5
         assert all(isinstance(u, User) for u in result)
@@ -98,7 +102,7 @@ class TestUserRepositoryBase:
         result = await repo.get_all()
 
         assert len(result) == 4
-        assert all(u.id != test_users[0].id for u in result)
+        assert test_users[0].id not in {u.id for u in result}
 
     async def test_count_returns_correct_count(
         self,
@@ -138,21 +142,21 @@ class TestUserRepositoryBase:
 
         assert count == 5
 
-    async def test_create_user_success(self, db_session: AsyncSession, test_password: str):
+    async def test_create_user_success(self, db_session: AsyncSession, session_hashed_password: str):
         """create успешно создаёт пользователя в БД"""
         repo = UserRepository(db_session)
 
         new_user = User(
             id=uuid.uuid4(),
             email="new@example.com",
-            hashed_password=hash_password(test_password),
+            hashed_password=session_hashed_password,
             first_name="New",
             last_name="User",
             role=UserRole.CUSTOMER,
         )
 
         result = await repo.create(new_user)
-        await db_session.commit()
+        await db_session.flush()
 
         assert result.id is not None
         assert result.email == "new@example.com"
@@ -328,6 +332,68 @@ class TestUserRepositorySpecific:
         assert result is not None
         assert result.is_deleted is True
 
+    async def test_create_with_refresh_token_creates_user_and_token(
+        self,
+        db_session: AsyncSession,
+        session_hashed_password: str
+    ):
+        """create_with_refresh_token создаёт пользователя и его refresh токен"""
+        repo = UserRepository(db_session)
+        token_repo = RefreshTokenRepository(db_session)
+        user_id = uuid.uuid4()
+        token = RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=b"register_token",
+            user_id=user_id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+            device_info="Test Device",
+        )
+
+        user = await repo.create_with_refresh_token(
+            token,
+            id=user_id,
+            email="withtoken@example.com",
+            hashed_password=session_hashed_password,
+            first_name="With",
+            last_name="Token",
+        )
+
+        assert user is not None
+        assert user.id == user_id
+        assert user.created_at is not None
+        db_token = await token_repo.get_by_token_hash(b"register_token")
+        assert db_token is not None
+        assert db_token.user_id == user_id
+
+    async def test_create_with_refresh_token_taken_email_creates_nothing(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        session_hashed_password: str
+    ):
+        """При занятом email не создаются ни пользователь, ни токен"""
+        repo = UserRepository(db_session)
+        token_repo = RefreshTokenRepository(db_session)
+        user_id = uuid.uuid4()
+        token = RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=b"duplicate_token",
+            user_id=user_id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        )
+
+        user = await repo.create_with_refresh_token(
+            token,
+            id=user_id,
+            email=test_user.email,
+            hashed_password=session_hashed_password,
+            first_name="Dup",
+            last_name="User",
+        )
+
+        assert user is None
+        assert await token_repo.get_by_token_hash(b"duplicate_token") is None
+
     async def test_email_exists_returns_true_for_existing_email(
         self,
         db_session: AsyncSession,
@@ -395,7 +461,7 @@ class TestUserRepositorySpecific:
             role=UserRole.CUSTOMER,
         )
         await repo.create(another_user)
-        await db_session.commit()
+        await db_session.flush()
 
         # Проверяем что email другого пользователя существует даже при исключении test_user
         exists = await repo.email_exists(another_user.email, exclude_user_id=test_user.id)
@@ -406,17 +472,20 @@ class TestUserRepositorySpecific:
         self,
         db_session: AsyncSession,
         test_user: User,
-        test_admin: User
+        test_admin: User,
+        assert_query_count
     ):
-        """get_by_role возвращает только пользователей с ролью CUSTOMER"""
+        """get_by_role возвращает только пользователей с ролью CUSTOMER одним запросом"""
         repo = UserRepository(db_session)
 
-        result = await repo.get_by_role(UserRole.CUSTOMER)
+        with assert_query_count(1):
+            result = await repo.get_by_role(UserRole.CUSTOMER)
 
         assert len(result) >= 1
-        assert all(u.role == UserRole.CUSTOMER for u in result)
-        assert any(u.id == test_user.id for u in result)
-        assert not any(u.id == test_admin.id for u in result)
+        assert {u.role for u in result} == {UserRole.CUSTOMER}
+        ids = {u.id for u in result}
+        assert test_user.id in ids
+        assert test_admin.id not in ids
 
     async def test_get_by_role_admin(
         self,
@@ -430,9 +499,10 @@ class TestUserRepositorySpecific:
         result = await repo.get_by_role(UserRole.ADMIN)
 
         assert len(result) >= 1
-        assert all(u.role == UserRole.ADMIN for u in result)
-        assert any(u.id == test_admin.id for u in result)
-        assert not any(u.id == test_user.id for u in result)
+        assert {u.role for u in result} == {UserRole.ADMIN}
+        ids = {u.id for u in result}
+        assert test_admin.id in ids
+        assert test_user.id not in ids
 
     async def test_get_by_role_with_pagination(
         self,
@@ -460,7 +530,7 @@ class TestUserRepositorySpecific:
 
         result = await repo.get_by_role(UserRole.CUSTOMER)
 
-        assert all(u.id != test_users[0].id for u in result)
+        assert test_users[0].id not in {u.id for u in result}
 
     async def test_get_by_role_includes_soft_deleted_when_requested(
         self,
@@ -477,21 +547,95 @@ class TestUserRepositorySpecific:
         assert deleted_user is not None
         assert deleted_user.is_deleted is True
 
+    async def test_soft_delete_with_tokens_revokes_tokens(
+        self,
+        db_session: AsyncSession,
+        test_user: User
+    ):
+        """soft_delete_with_tokens удаляет пользователя и отзывает его токены"""
+        repo = UserRepository(db_session)
+        token_repo = RefreshTokenRepository(db_session)
+
+        token_hash = b"delete_with_tokens"
+        await token_repo.create(RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=token_hash,
+            user_id=test_user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        ))
+        await db_session.flush()
+
+        assert await repo.soft_delete_with_tokens(test_user.id) is True
+        assert await repo.get_by_id(test_user.id) is None
+        assert await token_repo.is_token_valid(token_hash) is False
+
+        # Повторное удаление — пользователь уже удалён
+        assert await repo.soft_delete_with_tokens(test_user.id) is False
+
+    async def test_soft_delete_with_tokens_non_existing_user(self, db_session: AsyncSession):
+        """soft_delete_with_tokens возвращает False для несуществующего пользователя"""
+        repo = UserRepository(db_session)
+
+        assert await repo.soft_delete_with_tokens(uuid.uuid4()) is False
+
+    async def test_set_password_and_revoke_tokens(
+        self,
+        db_session: AsyncSession,
+        test_user: User
+    ):
+        """set_password_and_revoke_tokens меняет хеш пароля и отзывает токены"""
+        repo = UserRepository(db_session)
+        token_repo = RefreshTokenRepository(db_session)
+
+        token_hash = b"password_change"
+        await token_repo.create(RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=token_hash,
+            user_id=test_user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        ))
+        await db_session.flush()
+
+        updated = await repo.set_password_and_revoke_tokens(test_user.id, "new-hash")
+
+        assert updated is True
+        assert (await repo.get_by_id(test_user.id)).hashed_password == "new-hash"
+        assert await token_repo.is_token_valid(token_hash) is False
+
+    async def test_iter_by_role_chunks_yields_all_users_in_chunks(
+        self,
+        db_session: AsyncSession,
+        test_users: list[User],
+        test_admin: User
+    ):
+        """iter_by_role_chunks выдаёт всех пользователей роли порциями не больше chunk_size"""
+        repo = UserRepository(db_session)
+
+        chunks = [chunk async for chunk in repo.iter_by_role_chunks(UserRole.CUSTOMER, chunk_size=2)]
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        ids = {u.id for chunk in chunks for u in chunk}
+        assert ids == {u.id for u in test_users}
+        assert test_admin.id not in ids
+
     async def test_get_active_users_returns_only_active(
         self,
         db_session: AsyncSession,
         test_user: User,
-        test_inactive_user: User
+        test_inactive_user: User,
+        assert_query_count
     ):
-        """get_active_users возвращает только активных пользователей"""
+        """get_active_users возвращает только активных пользователей одним запросом"""
         repo = UserRepository(db_session)
 
-        result = await repo.get_active_users()
+        with assert_query_count(1):
+            result = await repo.get_active_users()
 
         assert len(result) >= 1
         assert all(u.is_active is True for u in result)
-        assert any(u.id == test_user.id for u in result)
-        assert not any(u.id == test_inactive_user.id for u in result)
+        ids = {u.id for u in result}
+        assert test_user.id in ids
+        assert test_inactive_user.id not in ids
 
     async def test_get_active_users_with_pagination(
         self,
@@ -519,28 +663,30 @@ class TestUserRepositorySpecific:
 
         result = await repo.get_active_users()
 
-        assert not any(u.id == test_user.id for u in result)
+        assert test_user.id not in {u.id for u in result}
 
     async def test_get_verified_users_returns_only_verified(
         self,
         db_session: AsyncSession,
         test_user: User,
-        test_unverified_user: User
+        test_unverified_user: User,
+        assert_query_count
     ):
-        """get_verified_users возвращает только верифицированных пользователей"""
+        """get_verified_users возвращает только верифицированных пользователей одним запросом"""
         repo = UserRepository(db_session)
 
         # Делаем test_user верифицированным
         test_user.is_verified = True
-        await db_session.commit()
-        await db_session.refresh(test_user)
+        await db_session.flush()
 
-        result = await repo.get_verified_users()
+        with assert_query_count(1):
+            result = await repo.get_verified_users()
 
         assert len(result) >= 1
         assert all(u.is_verified is True for u in result)
-        assert any(u.id == test_user.id for u in result)
-        assert not any(u.id == test_unverified_user.id for u in result)
+        ids = {u.id for u in result}
+        assert test_user.id in ids
+        assert test_unverified_user.id not in ids
 
     async def test_get_verified_users_with_pagination(
         self,
@@ -553,7 +699,7 @@ class TestUserRepositorySpecific:
         # Делаем всех пользователей верифицированными
         for user in test_users:
             user.is_verified = True
-        await db_session.commit()
+        await db_session.flush()
 
         result_page1 = await repo.get_verified_users(skip=0, limit=2)
         result_page2 = await repo.get_verified_users(skip=2, limit=2)
@@ -573,4 +719,57 @@ class TestUserRepositorySpecific:
 
         result = await repo.get_verified_users()
 
-        assert not any(u.id == test_user.id for u in result)
+        assert test_user.id not in {u.id for u in result}
+
+    @pytest.mark.parametrize(
+        "search",
+        [
+            pytest.param("Te", id="short_prefix"),
+            pytest.param("Tes", id="partial_first_name"),
+            pytest.param("tes", id="case_insensitive"),
+            pytest.param("est@exa", id="email_substring"),
+        ],
+    )
+    async def test_get_filtered_users_search_matches_substring(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_admin: User,
+        search: str
+    ):
+        """search находит пользователя по подстроке независимо от длины запроса"""
+        repo = UserRepository(db_session)
+
+        result = await repo.get_filtered_users(search=search)
+
+        ids = {u.id for u in result}
+        assert test_user.id in ids
+        assert test_admin.id not in ids
+
+    async def test_get_filtered_users_search_by_email_domain(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_admin: User
+    ):
+        """search по домену email находит всех пользователей этого домена"""
+        repo = UserRepository(db_session)
+
+        result = await repo.get_filtered_users(search="example.com")
+
+        ids = {u.id for u in result}
+        assert test_user.id in ids
+        assert test_admin.id in ids
+
+    async def test_get_filtered_users_search_excludes_soft_deleted(
+        self,
+        db_session: AsyncSession,
+        test_user: User
+    ):
+        """search не возвращает soft-deleted пользователей"""
+        repo = UserRepository(db_session)
+        await repo.soft_delete(test_user.id)
+
+        result = await repo.get_filtered_users(search="Tes")
+
+        assert test_user.id not in {u.id for u in result}
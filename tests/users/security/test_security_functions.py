@@ -1,3 +1,7 @@
+import hashlib
+import hmac
+import uuid
+
 import pytest
 import time
 import jwt
@@ -6,11 +10,14 @@ from datetime import datetime, timedelta, timezone
 from app.core.security import (
     hash_password,
     verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     decode_access_token,
     decode_refresh_token,
     hash_refresh_token,
+    parse_token_subject,
 )
 from app.core.config import settings
 
@@ -31,6 +38,14 @@ def test_hash_password_returns_different_hash_each_time():
     assert len(hash2) > 0
 
 
+@pytest.mark.unit
+def test_hash_password_uses_configured_rounds():
+    """hash_password использует стоимость из settings.BCRYPT_ROUNDS"""
+    hashed = hash_password("TestPassword123")
+
+    assert hashed.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+
 @pytest.mark.unit
 def test_verify_password_with_correct_password():
     """Верификация пароля должна работать с корректным паролем"""
@@ -68,36 +83,61 @@ def test_hash_password_with_special_characters():
     assert verify_password(password, hashed) is True
 
 
+@pytest.mark.unit
+async def test_async_password_helpers_roundtrip():
+    """Асинхронные обёртки (пул потоков) совместимы с синхронными функциями"""
+    password = "AsyncPassword123"
+    hashed = await hash_password_async(password)
+
+    assert verify_password(password, hashed) is True
+    assert await verify_password_async(password, hashed) is True
+    assert await verify_password_async("WrongPassword456", hashed) is False
+
+
 # ============================================================================
 # Тесты для create_access_token() и decode_access_token()
 # ============================================================================
 
-@pytest.mark.unit
-def test_create_access_token_valid_payload():
-    """Access токен должен содержать корректные поля"""
-    user_id = "123e4567-e89b-12d3-a456-426614174000"
-    token = create_access_token(data={"sub": user_id})
+_TOKEN_USER_ID = "123e4567-e89b-12d3-a456-426614174000"
 
-    payload = decode_access_token(token)
 
-    assert payload["sub"] == user_id
-    assert payload["type"] == "access"
-    assert payload["iss"] == settings.TOKEN_ISSUER
-    assert "exp" in payload
-    assert "iat" in payload
-    assert "jti" in payload
+@pytest.fixture(scope="module")
+def access_token_bundle():
+    """Access токен и его payload, общие для тестов модуля (без подмены токена)"""
+    token = create_access_token(data={"sub": _TOKEN_USER_ID})
+    return token, decode_access_token(token)
+
+
+@pytest.fixture(scope="module")
+def refresh_token_bundle():
+    """Refresh токен и его payload, общие для тестов модуля (без подмены токена)"""
+    token = create_refresh_token(data={"sub": _TOKEN_USER_ID})
+    return token, decode_refresh_token(token)
 
 
 @pytest.mark.unit
-def test_decode_access_token_valid():
-    """Декодирование валидного access токена должно работать"""
-    user_id = "test-user-id"
-    token = create_access_token(data={"sub": user_id})
+@pytest.mark.parametrize(
+    "field,expected",
+    [
+        ("sub", _TOKEN_USER_ID),
+        ("type", "access"),
+        ("iss", settings.TOKEN_ISSUER),
+    ],
+)
+def test_access_token_valid_payload(access_token_bundle, field, expected):
+    """Access токен должен декодироваться и содержать корректные поля"""
+    _, payload = access_token_bundle
 
-    payload = decode_access_token(token)
+    assert payload[field] == expected
 
-    assert payload["sub"] == user_id
-    assert payload["type"] == "access"
+
+@pytest.mark.unit
+@pytest.mark.parametrize("claim", ["exp", "iat", "jti"])
+def test_access_token_contains_registered_claims(access_token_bundle, claim):
+    """Access токен должен содержать служебные claims"""
+    _, payload = access_token_bundle
+
+    assert claim in payload
 
 
 @pytest.mark.unit
@@ -162,9 +202,7 @@ def test_access_token_with_custom_data():
     token = create_access_token(data=custom_data)
     payload = decode_access_token(token)
 
-    assert payload["sub"] == "user-123"
-    assert payload["role"] == "admin"
-    assert payload["permissions"] == ["read", "write"]
+    assert {key: payload[key] for key in custom_data} == custom_data
 
 
 # ============================================================================
@@ -172,30 +210,39 @@ def test_access_token_with_custom_data():
 # ============================================================================
 
 @pytest.mark.unit
-def test_create_refresh_token_valid_payload():
-    """Refresh токен должен содержать type='refresh' и больший exp"""
-    user_id = "test-user-id"
-    access_token = create_access_token(data={"sub": user_id})
-    refresh_token = create_refresh_token(data={"sub": user_id})
+@pytest.mark.parametrize(
+    "field,expected",
+    [
+        ("sub", _TOKEN_USER_ID),
+        ("type", "refresh"),
+    ],
+)
+def test_refresh_token_valid_payload(refresh_token_bundle, field, expected):
+    """Refresh токен должен декодироваться и содержать type='refresh'"""
+    _, payload = refresh_token_bundle
+
+    assert payload[field] == expected
+
 
-    access_payload = decode_access_token(access_token)
-    refresh_payload = decode_refresh_token(refresh_token)
+@pytest.mark.unit
+def test_refresh_token_outlives_access_token(access_token_bundle, refresh_token_bundle):
+    """Refresh токен должен иметь больший exp, чем access токен"""
+    _, access_payload = access_token_bundle
+    _, refresh_payload = refresh_token_bundle
 
-    assert refresh_payload["type"] == "refresh"
-    assert refresh_payload["sub"] == user_id
     assert refresh_payload["exp"] > access_payload["exp"]  # Refresh живёт дольше
 
 
 @pytest.mark.unit
-def test_decode_refresh_token_valid():
-    """Декодирование валидного refresh токена должно работать"""
-    user_id = "test-user-id"
-    token = create_refresh_token(data={"sub": user_id})
+def test_decode_refresh_token_repeated_calls_return_independent_copies():
+    """Повторное декодирование (из кэша) возвращает тот же payload, но отдельный объект"""
+    token = create_refresh_token(data={"sub": "test-user-id"})
 
-    payload = decode_refresh_token(token)
+    payload1 = decode_refresh_token(token)
+    payload1["sub"] = "tampered"
+    payload2 = decode_refresh_token(token)
 
-    assert payload["sub"] == user_id
-    assert payload["type"] == "refresh"
+    assert payload2["sub"] == "test-user-id"
 
 
 @pytest.mark.unit
@@ -221,11 +268,10 @@ def test_decode_refresh_token_expired():
 
 
 @pytest.mark.unit
-def test_decode_refresh_token_with_wrong_secret():
+def test_decode_refresh_token_with_wrong_secret(refresh_token_bundle):
     """Декодирование refresh токена с SECRET_KEY вместо REFRESH_TOKEN_SECRET должно вызывать jwt.InvalidSignatureError"""
-    user_id = "test-user-id"
-    # Создаём токен с правильным секретом
-    token = create_refresh_token(data={"sub": user_id})
+    # Токен подписан правильным секретом
+    token, _ = refresh_token_bundle
 
     # Пытаемся декодировать с неправильным секретом (SECRET_KEY)
     with pytest.raises(jwt.InvalidSignatureError):
@@ -233,11 +279,12 @@ def test_decode_refresh_token_with_wrong_secret():
 
 
 @pytest.mark.unit
-def test_refresh_token_uses_different_secret_than_access():
+def test_refresh_token_uses_different_secret_than_access(
+    access_token_bundle, refresh_token_bundle
+):
     """Refresh токен должен использовать отдельный секрет"""
-    user_id = "test-user-id"
-    access_token = create_access_token(data={"sub": user_id})
-    refresh_token = create_refresh_token(data={"sub": user_id})
+    access_token, _ = access_token_bundle
+    refresh_token, _ = refresh_token_bundle
 
     # Access токен не должен декодироваться REFRESH_TOKEN_SECRET
     with pytest.raises(jwt.InvalidSignatureError):
@@ -253,13 +300,13 @@ def test_refresh_token_uses_different_secret_than_access():
 # ============================================================================
 
 @pytest.mark.unit
-def test_hash_refresh_token_returns_sha256():
-    """hash_refresh_token должен возвращать SHA-256 хеш (64 символа hex)"""
+def test_hash_refresh_token_returns_16_bytes():
+    """hash_refresh_token должен возвращать 16 байт (усечённый HMAC-SHA256)"""
     token = "some-refresh-token-12345"
     token_hash = hash_refresh_token(token)
 
-    assert len(token_hash) == 64  # SHA-256 в hex = 64 символа
-    assert all(c in "0123456789abcdef" for c in token_hash)  # Только hex символы
+    assert isinstance(token_hash, bytes)
+    assert len(token_hash) == 16
 
 
 @pytest.mark.unit
@@ -272,6 +319,25 @@ def test_hash_refresh_token_deterministic():
     assert hash1 == hash2
 
 
+@pytest.mark.unit
+def test_hash_refresh_token_is_keyed():
+    """Хеш зависит от секретного ключа и не совпадает с обычным SHA-256"""
+    token = "test-token-123"
+
+    assert hash_refresh_token(token) != hashlib.sha256(token.encode()).digest()[:16]
+
+
+@pytest.mark.unit
+def test_hash_refresh_token_key_differs_from_signing_secret():
+    """Ключ хеширования не совпадает с секретами подписи JWT (разделение доменов)"""
+    token = "test-token-123"
+    token_hash = hash_refresh_token(token)
+
+    for secret in (settings.REFRESH_TOKEN_SECRET, settings.SECRET_KEY):
+        signed = hmac.new(secret.encode(), token.encode(), hashlib.sha256).digest()
+        assert token_hash != signed[:16]
+
+
 @pytest.mark.unit
 def test_hash_refresh_token_different_tokens():
     """Разные токены должны давать разные хеши"""
@@ -282,3 +348,25 @@ def test_hash_refresh_token_different_tokens():
     hash2 = hash_refresh_token(token2)
 
     assert hash1 != hash2
+
+
+# ============================================================================
+# Тесты для parse_token_subject()
+# ============================================================================
+
+@pytest.mark.unit
+def test_parse_token_subject_returns_uuid():
+    """parse_token_subject преобразует sub в UUID"""
+    user_id = uuid.uuid4()
+
+    assert parse_token_subject(str(user_id)) == user_id
+
+
+@pytest.mark.unit
+def test_parse_token_subject_invalid_raises_value_error():
+    """Невалидный sub вызывает ValueError (ошибки не кэшируются)"""
+    with pytest.raises(ValueError):
+        parse_token_subject("not-a-uuid")
+
+    with pytest.raises(ValueError):
+        parse_token_subject("not-a-uuid")